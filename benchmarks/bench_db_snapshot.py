@@ -0,0 +1,82 @@
+"""
+Compare data.db in the default and snapshot modes across forked workers.
+
+In the default mode each worker reads data.db into its own SQLite page
+cache; in snapshot mode every worker maps the whole file and shares its
+pages. Each worker runs random Unihan lookups through el_data.db and
+reports its per-lookup latency and memory: RSS, and PSS (proportional set
+size, which splits shared pages between the processes mapping them). PSS
+is read from /proc and is only reported on Linux.
+
+    python benchmarks/bench_db_snapshot.py --workers 16 --lookups 20000
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import time
+
+import el_data.db as db
+
+def _memory_kib() -> tuple[int, int | None]:
+    rss = pss = None
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    rss = int(line.split()[1])
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    pss = int(line.split()[1])
+    except OSError:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss, pss
+
+def _worker(args):
+    chars, lookups, seed = args
+    rng = random.Random(seed)
+    query = 'SELECT * FROM unihan WHERE char = ?'
+    timings = []
+    for _ in range(lookups):
+        char = rng.choice(chars)
+        start = time.perf_counter()
+        db.fetchone(query, (char,))
+        timings.append(time.perf_counter() - start)
+    rss, pss = _memory_kib()
+    return statistics.median(timings), sorted(timings)[int(len(timings) * 0.99)], rss, pss
+
+def run(snapshot: bool, workers: int, lookups: int, chars: list[str]) -> None:
+    db.configure(snapshot=snapshot)
+    ctx = multiprocessing.get_context('fork')
+    with ctx.Pool(workers) as pool:
+        results = pool.map(_worker, [(chars, lookups, seed) for seed in range(workers)])
+    medians, p99s, rss, pss = zip(*results)
+    label = 'snapshot' if snapshot else 'default'
+    mmap_size, cache_size = db.fetchone('PRAGMA mmap_size')[0], db.fetchone('PRAGMA cache_size')[0]
+    print(f'{label:>8} (mmap_size {mmap_size}, cache_size {cache_size}): median {statistics.median(medians) * 1e6:7.1f} us, '
+          f'p99 {statistics.median(p99s) * 1e6:7.1f} us, '
+          f'RSS total {sum(rss) / 1024:8.1f} MiB', end='')
+    if None not in pss:
+        print(f', PSS total {sum(pss) / 1024:8.1f} MiB')
+    else:
+        print()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--lookups', type=int, default=20000)
+    parser.add_argument('--db', default=db.DATA_DB, help='Path to data.db')
+    args = parser.parse_args()
+    db.DATA_DB = args.db
+    chars = [row[0] for row in db.fetchall('SELECT char FROM unihan')]
+    print(f'{args.db}: {os.path.getsize(args.db) / 2**20:.1f} MiB, {len(chars)} Unihan rows, '
+          f'{args.workers} workers x {args.lookups} lookups')
+    for snapshot in (False, True):
+        run(snapshot, args.workers, args.lookups, chars)
+
+if __name__ == '__main__':
+    main()
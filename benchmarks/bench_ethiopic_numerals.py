@@ -0,0 +1,63 @@
+"""
+Measure Ethiopic numeral parsing, formatting and scanning throughput.
+
+Builds an Amharic-like text of the requested size in which a fraction of
+the words are Ethiopic numerals, then times int_to_ethiopic(),
+ethiopic_to_int(), replace_ethiopic_numerals() on the whole text, and
+replace_ethiopic_numerals_iter() over the text split into lines.
+
+    python benchmarks/bench_ethiopic_numerals.py --size 8 --numbers 200000
+"""
+
+import argparse
+import random
+import time
+
+import el_data.ethiopic as eth
+
+WORDS = ['ሰላም', 'ዓመት', 'ቤት', 'ገበያ', 'ኢትዮጵያ', 'መጽሐፍ', 'ቁጥር', 'ዓ.ም.']
+
+def _timed(label: str, func, units: float, unit: str):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f'{label:>22}: {elapsed * 1000:9.1f} ms, {units / elapsed:12,.0f} {unit}/s')
+    return result
+
+def _text(size: int, rng: random.Random) -> str:
+    parts, length = [], 0
+    while length < size:
+        if rng.random() < 0.2:
+            word = eth.int_to_ethiopic(rng.randrange(1, 10**rng.randrange(1, 10)))
+        else:
+            word = rng.choice(WORDS)
+        parts.append(word)
+        length += len(word.encode('utf-8')) + 1
+        parts.append('\n' if rng.random() < 0.05 else ' ')
+    return ''.join(parts)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=float, default=8, help='Text size in MiB of UTF-8')
+    parser.add_argument('--numbers', type=int, default=200000, help='Values to format and parse')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    values = [rng.randrange(1, 10**rng.randrange(1, 16)) for _ in range(args.numbers)]
+    numerals = _timed('int_to_ethiopic', lambda: [eth.int_to_ethiopic(n) for n in values], len(values), 'numbers')
+    eth.ethiopic_to_int.cache_clear()
+    parsed = _timed('ethiopic_to_int', lambda: [eth.ethiopic_to_int(s) for s in numerals], len(values), 'numbers')
+    assert parsed == values
+
+    text = _text(int(args.size * 2**20), rng)
+    mib = len(text.encode('utf-8')) / 2**20
+    print(f'text: {mib:.1f} MiB, {sum(1 for _ in eth.find_ethiopic_numerals(text))} numerals')
+    eth.ethiopic_to_int.cache_clear()
+    whole = _timed('replace (whole text)', lambda: eth.replace_ethiopic_numerals(text), mib, 'MiB')
+    lines = text.splitlines(keepends=True)
+    streamed = _timed('replace (streamed)', lambda: ''.join(eth.replace_ethiopic_numerals_iter(lines)), mib, 'MiB')
+    assert streamed == whole
+
+if __name__ == '__main__':
+    main()
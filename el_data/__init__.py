@@ -13,9 +13,11 @@ from .ethiopic import *
 from .encodings import *
 from .cldr import *
 from .data import *
+from .tables import *
 
 del(unihan)
 del(ethiopic)
 del(encodings)
 del(cldr)
 del(data)
+del(tables)
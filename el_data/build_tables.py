@@ -0,0 +1,24 @@
+"""
+Rebuild the packaged Unicode property tables (ucd_tables.dat) from ICU.
+
+    python -m el_data.build_tables [filename]
+
+This is a separate module so that running it does not also import
+el_data.tables, through the package, under a second name.
+"""
+
+import sys as _sys
+
+import icu as _icu
+
+from .data import BINARY_PROPERTIES
+from .tables import TABLES_FILE, build_property_tables, write_property_tables
+
+def main(argv: list[str] | None = None) -> None:
+    argv = _sys.argv[1:] if argv is None else argv
+    filename = argv[0] if argv else TABLES_FILE
+    write_property_tables(build_property_tables(BINARY_PROPERTIES), BINARY_PROPERTIES, filename)
+    print(f'Unicode {_icu.UNICODE_VERSION} property tables written to {filename}')
+
+if __name__ == '__main__':
+    main()
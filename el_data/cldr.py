@@ -1,81 +1,651 @@
+from collections import OrderedDict as _OrderedDict
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor, as_completed as _as_completed
+import hashlib as _hashlib
+from io import BytesIO as _BytesIO
+import json as _json
+import logging as _logging
+import os as _os
+import os.path as _path
+from pathlib import Path as _Path
+import re as _re
+import threading as _threading
+import time as _time
 import icu as _icu
-import xml.etree.ElementTree as _ET
+from lxml import etree as _etree
 import requests as _requests
 
-def get_exemplars(locale_id: str, use_sldr: bool = False) -> dict[str, str]:
+_logger = _logging.getLogger(__name__)
+
+CLDR_URL = 'https://raw.githubusercontent.com/unicode-org/cldr/main/common/main/{locale_id}.xml'
+SLDR_URL = 'https://raw.githubusercontent.com/silnrsi/sldr/refs/heads/master/sldr/{initial_letter}/{locale_id}.xml'
+CLDR_SUPPLEMENTAL_URL = 'https://raw.githubusercontent.com/unicode-org/cldr/main/common/supplemental/supplementalData.xml'
+
+# On-disk LDML cache. Files are stored as <cache dir>/<source>/<key>.xml with
+# a <key>.json sidecar holding the URL, HTTP validators and fetch time.
+CACHE_DIR_ENV = 'EL_DATA_CACHE_DIR'
+OFFLINE_ENV = 'EL_DATA_OFFLINE'
+# Top-level LDML elements CLDR objects keep in memory.
+LDML_SECTIONS = ('identity', 'characters', 'delimiters', 'layout')
+
+# Seconds a cached file is used without revalidating it.
+CACHE_MAX_AGE = 24 * 60 * 60
+REQUEST_TIMEOUT = 10
+
+_cache_settings = {
+    'cache_dir': _os.environ.get(CACHE_DIR_ENV) or _path.join(_path.expanduser('~'), '.cache', 'el_data', 'ldml'),
+    'offline': _os.environ.get(OFFLINE_ENV, '').lower() not in ('', '0', 'false', 'no'),
+    'max_age': CACHE_MAX_AGE,
+    'timeout': REQUEST_TIMEOUT
+}
+_sessions = _threading.local()
+
+class LDMLUnavailableError(LookupError):
+    """Raised in offline mode when an LDML file is not in the cache."""
+
+class CLDRLoadError(Exception):
+    """A locale that could not be loaded by load_locales()."""
+    def __init__(self, locale_id: str, reason: str):
+        super().__init__(f'{locale_id}: {reason}')
+        self.locale_id = locale_id
+        self.reason = reason
+
+def configure_ldml_cache(cache_dir: str | None = None, offline: bool | None = None, max_age: float | None = None, timeout: float | None = None) -> dict:
+    """Change LDML cache settings. Arguments left as None are unchanged.
+
+    Args:
+        cache_dir (str | None, optional): Cache directory. Defaults to
+            $EL_DATA_CACHE_DIR or ~/.cache/el_data/ldml.
+        offline (bool | None, optional): Never use the network; only cached
+            files are read. Defaults to $EL_DATA_OFFLINE.
+        max_age (float | None, optional): Seconds before a cached file is
+            revalidated with the server. Defaults to CACHE_MAX_AGE.
+        timeout (float | None, optional): HTTP timeout in seconds.
+
+    Returns:
+        dict: The current settings.
+    """
+    for key, value in (('cache_dir', cache_dir), ('offline', offline), ('max_age', max_age), ('timeout', timeout)):
+        if value is not None:
+            _cache_settings[key] = value
+    return dict(_cache_settings)
+
+def _session() -> _requests.Session:
+    session = getattr(_sessions, 'session', None)
+    if session is None:
+        session = _sessions.session = _requests.Session()
+    return session
+
+def _source(use_sldr: bool) -> str:
+    return 'sldr' if use_sldr else 'cldr'
+
+def _ldml_url(locale_id: str, use_sldr: bool = False) -> str:
+    if use_sldr:
+        return SLDR_URL.format(initial_letter=locale_id[0], locale_id=locale_id)
+    return CLDR_URL.format(locale_id=locale_id)
+
+def _cache_paths(source: str, key: str) -> tuple[_Path, _Path]:
+    base = _Path(_cache_settings['cache_dir']) / source / key
+    return base.with_suffix('.xml'), base.with_suffix('.json')
+
+def _write_atomic(filename: _Path, data: bytes) -> None:
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    tmp = filename.with_name(f'{filename.name}.{_os.getpid()}.{_threading.get_ident()}.tmp')
+    tmp.write_bytes(data)
+    _os.replace(tmp, filename)
+
+def _read_cache(source: str, key: str) -> tuple[dict | None, bytes | None]:
+    xml_file, meta_file = _cache_paths(source, key)
+    try:
+        meta = _json.loads(meta_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None, None
+    if meta.get('status') == 404:
+        return meta, None
+    try:
+        return meta, xml_file.read_bytes()
+    except OSError:
+        return None, None
+
+def _write_cache(source: str, key: str, meta: dict, content: bytes | None) -> None:
+    xml_file, meta_file = _cache_paths(source, key)
+    try:
+        if content is not None:
+            _write_atomic(xml_file, content)
+        _write_atomic(meta_file, _json.dumps(meta).encode('utf-8'))
+    except OSError as e:
+        _logger.warning("Unable to write LDML cache entry %s/%s: %s", source, key, e)
+
+def _fetch_cached(url: str, source: str, key: str) -> bytes | None:
+    """Return the LDML document at url, using and maintaining the on-disk cache.
+
+    Returns None if the server reports the file does not exist.
+    """
+    meta, content = _read_cache(source, key)
+    if _cache_settings['offline']:
+        if meta is None:
+            raise LDMLUnavailableError(f'{source}/{key} is not cached and el_data is in offline mode.')
+        return content
+    if meta is not None and _time.time() - meta.get('fetched', 0) < _cache_settings['max_age']:
+        return content
+    headers = {}
+    if content is not None:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+    try:
+        response = _session().get(url, headers=headers, timeout=_cache_settings['timeout'])
+    except _requests.RequestException as e:
+        if meta is None:
+            raise
+        _logger.warning("Using cached %s/%s, revalidation failed: %s", source, key, e)
+        return content
+    now = _time.time()
+    if response.status_code == 304 and content is not None:
+        meta['fetched'] = now
+        _write_cache(source, key, meta, None)
+        return content
+    if response.status_code == 404:
+        _write_cache(source, key, {'url': url, 'status': 404, 'fetched': now}, None)
+        return None
+    if response.status_code != 200:
+        _logger.warning("HTTP %s fetching %s", response.status_code, url)
+        return content
+    meta = {
+        'url': url,
+        'status': 200,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'fetched': now
+    }
+    _write_cache(source, key, meta, response.content)
+    return response.content
+
+def fetch_ldml(locale_id: str, use_sldr: bool = False) -> bytes | None:
+    """Return the raw LDML file for a locale from CLDR or SLDR, or None if there is none.
+
+    Files are served from the on-disk cache where possible; see
+    configure_ldml_cache() and seed_ldml_cache().
+    """
     locale_id = locale_id.replace('-', '_')
-    exemplar_data = dict()
-    url = rf'https://raw.githubusercontent.com/unicode-org/cldr/main/common/main/{locale_id}.xml'
+    return _fetch_cached(_ldml_url(locale_id, use_sldr), _source(use_sldr), locale_id)
+
+def _url_key(url: str) -> str:
+    return _hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+def fetch_ldml_url(url: str) -> bytes | None:
+    """Return the LDML file at an arbitrary URL, cached like fetch_ldml()."""
+    return _fetch_cached(url, 'url', _url_key(url))
+
+def seed_ldml_cache(path: str, use_sldr: bool = False) -> int:
+    """Populate the LDML cache from a local CLDR or SLDR checkout.
+
+    For CLDR, common/supplemental/supplementalData.xml is cached too, as the
+    parentLocales data used for inheritance.
+
+    Args:
+        path (str): Root of a CLDR checkout (or its common/main directory),
+            or of an SLDR checkout (or its sldr directory).
+        use_sldr (bool, optional): Whether path is an SLDR checkout.
+            Defaults to False.
+
+    Returns:
+        int: Number of files added to the cache.
+    """
+    root = _Path(path)
+    supplemental = None
     if use_sldr:
-        initial_letter = locale_id[0]
-        url = rf'https://raw.githubusercontent.com/silnrsi/sldr/refs/heads/master/sldr/{initial_letter}/{locale_id}.xml'
-    response = _requests.get(url)
-    if response.status_code not in (404, 500):
-        tree = _ET.fromstring(response.text)
-        result = tree.findall('characters/exemplarCharacters')
-        for element in result:
-            type = element.attrib.get('type', 'main')
-            if type not in ["numbers", "punctuation"]:
-                if element.text and element.text != '↑↑↑':
-                    exemplar_data[type] = _icu.UnicodeSet(rf'{element.text}')
-        return exemplar_data
-    return None
+        if (root / 'sldr').is_dir():
+            root = root / 'sldr'
+        files = root.glob('*/*.xml')
+    else:
+        if (root / 'common' / 'main').is_dir():
+            root = root / 'common' / 'main'
+        supplemental = root.parent / 'supplemental' / 'supplementalData.xml'
+        files = root.glob('*.xml')
+    source = _source(use_sldr)
+    now = _time.time()
+    count = 0
+    for filename in files:
+        locale_id = filename.stem
+        meta = {'url': _ldml_url(locale_id, use_sldr), 'status': 200, 'etag': None, 'last_modified': None, 'fetched': now, 'seeded': str(filename)}
+        _write_cache(source, locale_id, meta, filename.read_bytes())
+        count += 1
+    if supplemental is not None and supplemental.is_file():
+        meta = {'url': CLDR_SUPPLEMENTAL_URL, 'status': 200, 'etag': None, 'last_modified': None, 'fetched': now, 'seeded': str(supplemental)}
+        _write_cache('url', _url_key(CLDR_SUPPLEMENTAL_URL), meta, supplemental.read_bytes())
+        count += 1
+    return count
+
+def _parse_ldml(content: bytes | None, sections=LDML_SECTIONS):
+    """Parse an LDML file, keeping only the given top-level sections.
+
+    The file is streamed with iterparse. Elements of other sections are
+    discarded as soon as they are complete, so the tree that is returned
+    holds only the requested sections. If sections is None the whole
+    document is kept.
+    """
+    if content is None:
+        return None
+    if sections is None:
+        return _etree.fromstring(content, _etree.XMLParser(resolve_entities=False, remove_comments=True, remove_pis=True))
+    keep = set(sections)
+    root = None
+    depth = 0
+    skipping = False
+    for event, elem in _etree.iterparse(_BytesIO(content), events=('start', 'end'), resolve_entities=False, remove_comments=True, remove_pis=True):
+        if event == 'start':
+            depth += 1
+            if depth == 1:
+                root = elem
+            elif depth == 2:
+                skipping = elem.tag not in keep
+            continue
+        depth -= 1
+        if not skipping or depth == 0:
+            continue
+        if depth == 1:
+            root.remove(elem)
+        else:
+            elem.clear(keep_tail=False)
+            parent = elem.getparent()
+            while elem.getprevious() is not None:
+                del parent[0]
+    return root
+
+def _exemplars_from_tree(tree) -> dict[str, _icu.UnicodeSet]:
+    exemplar_data = dict()
+    result = tree.findall('characters/exemplarCharacters')
+    for element in result:
+        type = element.attrib.get('type', 'main')
+        if type not in ["numbers", "punctuation"]:
+            if element.text and element.text != '↑↑↑':
+                uset = _icu.UnicodeSet(rf'{element.text}')
+                uset.freeze()
+                exemplar_data[type] = uset
+    return exemplar_data
+
+# Parsed LDML of parent locales, shared by all locales that inherit from them.
+_parent_trees: dict[tuple[str, str], object] = {}
+_parent_locks: dict[tuple[str, str], _threading.Lock] = {}
+_parent_lock = _threading.Lock()
+_explicit_parents: dict[str, str] | None = None
+_explicit_parents_lock = _threading.Lock()
+
+def _shared_ldml(locale_id: str, use_sldr: bool = False):
+    """Parsed LDML of a locale, loaded once per process."""
+    key = (_source(use_sldr), locale_id)
+    with _parent_lock:
+        if key in _parent_trees:
+            return _parent_trees[key]
+        lock = _parent_locks.setdefault(key, _threading.Lock())
+    with lock:
+        if key not in _parent_trees:
+            _parent_trees[key] = _parse_ldml(fetch_ldml(locale_id, use_sldr))
+        return _parent_trees[key]
+
+def _read_explicit_parents() -> dict[str, str]:
+    try:
+        tree = _parse_ldml(fetch_ldml_url(CLDR_SUPPLEMENTAL_URL), ('parentLocales',))
+    except (LDMLUnavailableError, _requests.RequestException) as e:
+        _logger.warning("CLDR parentLocales unavailable, using truncation inheritance: %s", e)
+        return {}
+    parents = {}
+    if tree is not None:
+        for element in tree.findall('parentLocales'):
+            if element.get('component'):
+                continue
+            for parent_locale in element.findall('parentLocale'):
+                parent = parent_locale.get('parent')
+                parents.update(dict.fromkeys(parent_locale.get('locales', '').split(), parent))
+    return parents
+
+def _load_explicit_parents() -> dict[str, str]:
+    # CLDR's parentLocales override truncation, e.g. en_150 -> en_001 and
+    # az_Cyrl -> root. Without supplemental data, truncation is used. The
+    # result, including an empty mapping after a failure, is kept until
+    # clear_parent_cache().
+    global _explicit_parents
+    parents = _explicit_parents
+    if parents is None:
+        with _explicit_parents_lock:
+            if _explicit_parents is None:
+                _explicit_parents = _read_explicit_parents()
+            parents = _explicit_parents
+    return parents
+
+def _parent_locale(locale_id: str, use_sldr: bool = False) -> str | None:
+    if locale_id == 'root':
+        return None
+    if not use_sldr:
+        parent = _load_explicit_parents().get(locale_id)
+        if parent is not None:
+            return parent
+    if '_' in locale_id:
+        return locale_id.rsplit('_', 1)[0]
+    return None if use_sldr else 'root'
+
+def _parent_locales(locale_id: str, use_sldr: bool = False) -> list[str]:
+    """Parent chain of a locale, nearest first, e.g. am_Ethi_ET -> am_Ethi, am, root."""
+    parents = []
+    parent = _parent_locale(locale_id.replace('-', '_'), use_sldr)
+    while parent is not None and parent not in parents:
+        parents.append(parent)
+        parent = _parent_locale(parent, use_sldr)
+    return parents
+
+def clear_parent_cache() -> None:
+    """Forget parsed parent locales and CLDR parentLocales, so both are loaded again on next use."""
+    global _explicit_parents
+    with _parent_lock:
+        _parent_trees.clear()
+        _parent_locks.clear()
+    with _explicit_parents_lock:
+        _explicit_parents = None
+
+# Process-wide LRU cache of parsed exemplars, keyed by (locale, source, type).
+# Values are frozen UnicodeSets, resolved through the parent chain. The
+# entry with type None records which types a locale has, or None if the
+# locale has no LDML file.
+EXEMPLAR_CACHE_SIZE = 1024
+_exemplar_cache: _OrderedDict = _OrderedDict()
+_exemplar_lock = _threading.Lock()
+_exemplar_stats = {'hits': 0, 'misses': 0, 'maxsize': EXEMPLAR_CACHE_SIZE}
+
+def _exemplar_cache_get(key: tuple) -> tuple[bool, object]:
+    with _exemplar_lock:
+        if key in _exemplar_cache:
+            _exemplar_cache.move_to_end(key)
+            _exemplar_stats['hits'] += 1
+            return True, _exemplar_cache[key]
+        _exemplar_stats['misses'] += 1
+        return False, None
+
+def _exemplar_cache_put(key: tuple, value) -> None:
+    with _exemplar_lock:
+        _exemplar_cache[key] = value
+        _exemplar_cache.move_to_end(key)
+        while len(_exemplar_cache) > _exemplar_stats['maxsize']:
+            _exemplar_cache.popitem(last=False)
+
+def _cached_exemplars(locale_id: str, use_sldr: bool = False, load_tree=None) -> dict[str, _icu.UnicodeSet] | None:
+    source = _source(use_sldr)
+    found, types = _exemplar_cache_get((locale_id, source, None))
+    if found:
+        if types is None:
+            return None
+        exemplar_data = {}
+        for type in types:
+            found, uset = _exemplar_cache_get((locale_id, source, type))
+            if not found:
+                break
+            exemplar_data[type] = uset
+        else:
+            return exemplar_data
+    tree = load_tree() if load_tree is not None else _shared_ldml(locale_id, use_sldr)
+    if tree is None:
+        _exemplar_cache_put((locale_id, source, None), None)
+        return None
+    # Types missing from the file, or marked ↑↑↑, come from the nearest
+    # parent that has a file. Parents are resolved (and cached) in turn.
+    exemplar_data = {}
+    for parent in _parent_locales(locale_id, use_sldr):
+        parent_data = _cached_exemplars(parent, use_sldr)
+        if parent_data is not None:
+            exemplar_data.update(parent_data)
+            break
+    exemplar_data.update(_exemplars_from_tree(tree))
+    for type, uset in exemplar_data.items():
+        _exemplar_cache_put((locale_id, source, type), uset)
+    _exemplar_cache_put((locale_id, source, None), tuple(exemplar_data))
+    return exemplar_data
+
+def configure_exemplar_cache(maxsize: int) -> None:
+    """Set the maximum number of entries in the exemplar cache, evicting the oldest if needed."""
+    if maxsize < 1:
+        raise ValueError('maxsize must be at least 1.')
+    with _exemplar_lock:
+        _exemplar_stats['maxsize'] = maxsize
+        while len(_exemplar_cache) > maxsize:
+            _exemplar_cache.popitem(last=False)
+
+def exemplar_cache_info() -> dict[str, int]:
+    """Hits, misses, maximum size and current size of the exemplar cache."""
+    with _exemplar_lock:
+        return {**_exemplar_stats, 'currsize': len(_exemplar_cache)}
+
+def clear_exemplar_cache() -> None:
+    with _exemplar_lock:
+        _exemplar_cache.clear()
+        _exemplar_stats['hits'] = _exemplar_stats['misses'] = 0
+
+def get_exemplars(locale_id: str, use_sldr: bool = False) -> dict[str, _icu.UnicodeSet]:
+    """Exemplar sets of a locale, keyed by type, as frozen UnicodeSets.
+
+    Types the locale does not define, or marks with ↑↑↑, are inherited from
+    its parent locales (am_ET -> am -> root). Returns None if the locale has
+    no LDML file.
+    """
+    locale_id = locale_id.replace('-', '_')
+    return _cached_exemplars(locale_id, use_sldr, lambda: _parse_ldml(fetch_ldml(locale_id, use_sldr)))
+
+# Exemplar types checked by CLDR.check_coverage(), and characters it
+# treats as covered by default (separators, controls, format characters,
+# punctuation, symbols and digits are not part of these exemplar sets).
+COVERAGE_TYPES = ('main', 'auxiliary', 'index')
+COVERAGE_IGNORE = '[[:Z:][:Cc:][:Cf:][:P:][:S:][:N:]]'
+
+_NON_BMP = _re.compile('[\U00010000-\U0010FFFF]')
+
+def _grapheme_clusters(breaker, text: str):
+    """Yield (offset, cluster) for the extended grapheme clusters of text."""
+    breaker.setText(text)
+    # BreakIterator offsets are UTF-16 indices; map them to str indices.
+    index = None
+    if _NON_BMP.search(text) is not None:
+        index = []
+        for i, char in enumerate(text):
+            index.append(i)
+            if char > '\uffff':
+                index.append(i)
+        index.append(len(text))
+    start = 0
+    for end in breaker:
+        if index is not None:
+            end = index[end]
+        yield start, text[start:end]
+        start = end
+
+def _missing_types(cluster: str, sets: dict, nfc) -> tuple[str, ...]:
+    cluster = nfc.normalize(cluster)
+    return tuple(type for type, uset in sets.items() if not (uset.containsAll(cluster) or uset.contains(cluster)))
 
 class CLDR():
-    def __init__(self, locale_id:str, use_sldr: bool = False):
+    def __init__(self, locale_id:str, use_sldr: bool = False, sections=LDML_SECTIONS):
         self._locale_id = locale_id.replace('-', '_')
         self._use_sldr = use_sldr
+        self._sections = sections
         self._ldml = self._main_ldml()
         self._ld = _icu.LocaleData(self._locale_id)
+        self._coverage_sets = {}
 
     def __repr__(self):
         class_name = type(self).__name__
         return f"{class_name}(locale_id={self._locale_id}, use_sldr={self._use_sldr})"
 
     def _main_ldml(self):
-        url = rf'https://raw.githubusercontent.com/unicode-org/cldr/main/common/main/{self._locale_id}.xml'
-        if self._use_sldr:
-            initial_letter = self._locale_id[0]
-            url = rf'https://raw.githubusercontent.com/silnrsi/sldr/refs/heads/master/sldr/{initial_letter}/{self._locale_id}.xml'
-        response = _requests.get(url)
-        if response.status_code not in (404, 500):
-            tree = _ET.fromstring(response.text)
-            return tree
-        return None
+        return _parse_ldml(fetch_ldml(self._locale_id, self._use_sldr), self._sections)
 
-    def _other_ldml(self, url):
-        response = _requests.get(url)
-        if response.status_code not in (404, 500):
-            tree = _ET.fromstring(response.text)
-            return tree
-        return None
+    def _other_ldml(self, url, sections=None):
+        return _parse_ldml(fetch_ldml_url(url), sections)
+
+    def _exemplar_tree(self):
+        # Exemplars are cached process-wide, so they must come from a tree
+        # that has the characters section even if this instance pruned it.
+        if self._sections is None or 'characters' in self._sections:
+            return self._ldml
+        return _parse_ldml(fetch_ldml(self._locale_id, self._use_sldr), ('characters',))
 
     def get_exemplars(self):
-        exemplar_data = dict()
-        tree = self._ldml
-        if tree is not None:
-            result = tree.findall('characters/exemplarCharacters')
-            for element in result:
-                type = element.attrib.get('type', 'main')
-                if type not in ["numbers", "punctuation"]:
-                    if element.text and element.text != '↑↑↑':
-                        exemplar_data[type] = _icu.UnicodeSet(rf'{element.text}')
-            return exemplar_data
-        return None
+        return _cached_exemplars(self._locale_id, self._use_sldr, self._exemplar_tree)
 
     def get_main_exemplars(self, mode='uset'):
-        tree = self._ldml
-        if tree is not None:
-            result = tree.findall('characters/exemplarCharacters')
-            for element in result:
-                type = element.attrib.get('type', 'main')
-                if type == "main" and element.text and element.text != '↑↑↑':
-                    data = _icu.UnicodeSet(rf'{element.text}')
-                    match mode:
-                        case 'list':
-                            return list(data)
-                        case 'pattern':
-                            return data.toPattern()
-                        case '_':
-                            return data
+        exemplar_data = self.get_exemplars()
+        if exemplar_data is not None and 'main' in exemplar_data:
+            data = exemplar_data['main']
+            match mode:
+                case 'list':
+                    return list(data)
+                case 'pattern':
+                    return data.toPattern()
+                case _:
+                    return data
         return None
+
+    def _get_coverage_sets(self, types, case_insensitive: bool, ignore: str | None) -> dict[str, _icu.UnicodeSet]:
+        if isinstance(types, str):
+            raise TypeError(f'types must be an iterable of exemplar types, not a string: {types!r}')
+        types = tuple(types)
+        unknown = [type for type in types if type not in COVERAGE_TYPES]
+        if unknown:
+            raise ValueError(f'Unknown exemplar types: {", ".join(map(repr, unknown))}; expected {", ".join(COVERAGE_TYPES)}.')
+        key = (types, case_insensitive, ignore)
+        sets = self._coverage_sets.get(key)
+        if sets is None:
+            exemplar_data = self.get_exemplars() or {}
+            sets = {}
+            for type in types:
+                if type not in exemplar_data:
+                    continue
+                # Copies of frozen sets are frozen; build a new set instead.
+                uset = _icu.UnicodeSet()
+                uset.addAll(exemplar_data[type])
+                if type == 'auxiliary' and 'main' in exemplar_data:
+                    uset.addAll(exemplar_data['main'])
+                if case_insensitive:
+                    uset.closeOver(_icu.USET_CASE_INSENSITIVE)
+                if ignore:
+                    uset.addAll(_icu.UnicodeSet(ignore))
+                uset.freeze()
+                sets[type] = uset
+            self._coverage_sets[key] = sets
+        return sets
+
+    def check_coverage(self, texts, types=COVERAGE_TYPES, case_insensitive: bool = True, ignore: str | None = COVERAGE_IGNORE, max_offsets: int | None = None) -> dict[str, dict]:
+        """Find grapheme clusters not covered by the locale's exemplar sets.
+
+        Text is split into extended grapheme clusters, and each distinct
+        cluster is tested once per exemplar type. A cluster is covered if
+        the set contains it, in NFC, as a string or code point by code point.
+        The auxiliary set extends the main set, so auxiliary coverage is
+        checked against both.
+        Characters that are in every set are found first, so lines
+        containing only those are never segmented.
+
+        Args:
+            texts (str | Iterable[str]): A text, or a stream of texts. Offsets
+                run on across the stream; clusters do not span items.
+            types (Iterable[str], optional): Exemplar types to check. Types the
+                locale does not define are left out of the result. Defaults
+                to COVERAGE_TYPES.
+            case_insensitive (bool, optional): Close the sets over case.
+                Defaults to True.
+            ignore (str | None, optional): UnicodeSet pattern of characters
+                always treated as covered. Defaults to COVERAGE_IGNORE.
+            max_offsets (int | None, optional): Maximum offsets recorded per
+                type. Defaults to None, all offsets.
+
+        Raises:
+            TypeError: types is a string rather than an iterable of types.
+            ValueError: types includes a type other than COVERAGE_TYPES.
+
+        Returns:
+            dict[str, dict]: For each type, 'count' of uncovered clusters,
+                their 'offsets' and a 'clusters' dict of cluster counts.
+        """
+        sets = self._get_coverage_sets(types, case_insensitive, ignore)
+        results = {type: {'count': 0, 'offsets': [], 'clusters': {}} for type in sets}
+        if not sets:
+            return results
+        if isinstance(texts, str):
+            texts = (texts,)
+        nfc = _icu.Normalizer2.getNFCInstance()
+        breaker = _icu.BreakIterator.createCharacterInstance(_icu.Locale.getRoot())
+        checked = {}
+        base = 0
+        for text in texts:
+            uncovered = []
+            for char in set(text):
+                missing = checked.get(char)
+                if missing is None:
+                    missing = checked[char] = _missing_types(char, sets, nfc)
+                if missing:
+                    uncovered.append(char)
+            if not uncovered:
+                base += len(text)
+                continue
+            uncovered_re = _re.compile('[' + ''.join(_re.escape(char) for char in uncovered) + ']')
+            for line in text.splitlines(keepends=True):
+                if uncovered_re.search(line) is not None:
+                    for offset, cluster in _grapheme_clusters(breaker, line):
+                        missing = checked.get(cluster)
+                        if missing is None:
+                            missing = checked[cluster] = _missing_types(cluster, sets, nfc)
+                        for type in missing:
+                            result = results[type]
+                            result['count'] += 1
+                            if max_offsets is None or len(result['offsets']) < max_offsets:
+                                result['offsets'].append(base + offset)
+                            result['clusters'][cluster] = result['clusters'].get(cluster, 0) + 1
+                base += len(line)
+        return results
+
+def _load_locale(locale_id: str, use_sldr: bool) -> CLDR:
+    try:
+        cldr = CLDR(locale_id, use_sldr)
+    except Exception as e:
+        raise CLDRLoadError(locale_id, f'{type(e).__name__}: {e}') from e
+    if cldr._ldml is None:
+        raise CLDRLoadError(locale_id, f'no LDML file in {_source(use_sldr).upper()}')
+    # Resolve inheritance here too, so parents are parsed on the pool.
+    try:
+        cldr.get_exemplars()
+    except Exception as e:
+        raise CLDRLoadError(locale_id, f'inheritance: {type(e).__name__}: {e}') from e
+    return cldr
+
+def load_locales(locale_ids, use_sldr: bool = False, max_workers: int = 8) -> tuple[dict[str, CLDR], dict[str, CLDRLoadError]]:
+    """Load many locales concurrently.
+
+    Each locale is fetched, parsed and resolved through its parent chain on
+    a bounded thread pool. Parent locales are fetched and parsed once, on
+    the same pool, and shared by every locale that inherits from them, so
+    later lookups need no network access.
+
+    Args:
+        locale_ids (Iterable[str]): Locale identifiers.
+        use_sldr (bool, optional): Use SLDR rather than CLDR. Defaults to False.
+        max_workers (int, optional): Maximum concurrent fetches. Defaults to 8.
+
+    Returns:
+        tuple[dict[str, CLDR], dict[str, CLDRLoadError]]: Loaded locales and
+            the errors for locales that could not be loaded, both keyed by
+            the identifiers as given.
+    """
+    locale_ids = list(dict.fromkeys(locale_ids))
+    requested = {locale_id.replace('-', '_') for locale_id in locale_ids}
+    parents = {parent for locale_id in requested for parent in _parent_locales(locale_id, use_sldr)} - requested
+    loaded, errors = {}, {}
+    with _ThreadPoolExecutor(max_workers=max_workers) as executor:
+        parent_futures = {executor.submit(_shared_ldml, parent, use_sldr): parent for parent in parents}
+        futures = {executor.submit(_load_locale, locale_id, use_sldr): locale_id for locale_id in locale_ids}
+        for future in _as_completed(futures):
+            locale_id = futures[future]
+            try:
+                loaded[locale_id] = future.result()
+            except CLDRLoadError as e:
+                errors[locale_id] = e
+        for future in _as_completed(parent_futures):
+            if future.exception() is not None:
+                _logger.warning("Unable to load parent locale %s: %s", parent_futures[future], future.exception())
+    return loaded, errors
@@ -1,6 +1,10 @@
 
+from array import array as _array
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
 from functools import partialmethod as _partialmethod
 import html as _html
+from itertools import repeat as _repeat
+import pickle as _pickle
 try:
   from typing import Self as _Self
 except ImportError:
@@ -12,6 +16,8 @@ from rich.console import Console as _Console
 from rich.table import Table as _Table, box as _box
 from tabulate import tabulate as _tabulate
 
+from . import tables as _tables
+
 #
 # Refer to
 #   * https://unicode-org.github.io/icu/userguide/strings/properties.html
@@ -63,53 +69,84 @@ def get_property(char: str, property: int, short_name: bool = False, max_ver: fl
         print("Please specify a single character.")
         return None
 
+    accessor = _tables.property_accessor(property, short_name)
+    if accessor is not None:
+        return accessor(ord(char))
     if property in BINARY_PROPERTIES:
         return _icu.Char.hasBinaryProperty(char, property)
-    name_choice = 0 if short_name else 1
     value = _icu.Char.getIntPropertyValue(char, property)
-    return _icu.Char.getPropertyValueName(property, value, name_choice)
+    return _tables.property_value_name(property, value, short_name)
+
+_DECOMPOSABLE = _icu.UnicodeSet(r'[:^Decomposition_Type=None:]')
+_DECOMPOSABLE.freeze()
+_DECOMPOSITION_INDEXES = {}
+
+def _reverse_decomposition_index(compatibility: bool = False) -> dict[str, list[str]]:
+    """Map each character to the characters whose NFD (or NFKD) form contains it.
+
+    Built once per normalisation form. Lists are in code point order.
+    """
+    index = _DECOMPOSITION_INDEXES.get(compatibility)
+    if index is None:
+        normalizer = _icu.Normalizer2.getNFKDInstance() if compatibility else _icu.Normalizer2.getNFDInstance()
+        index = {}
+        for item in _DECOMPOSABLE:
+            for component in set(normalizer.normalize(item)):
+                index.setdefault(component, []).append(item)
+        _DECOMPOSITION_INDEXES[compatibility] = index
+    return index
 
 class UCD():
+    # Character name, data and entities are only looked up when first
+    # requested, so wrapping large texts only pays for what is used.
+    __slots__ = ('_char', '_cp', '_name', '_data', '_entities')
+
     def __init__(self, char):
         self._char = char
-        self._name = _icu.Char.charName(self._char)
         self._cp = f'{ord(self._char):04X}'
-        self.data = (
-            self._char,
-            self._cp,
-            self._name,
-            self.script(),
-            self.block(),
-            self.general_category_code(),
-            self.bidi_class_code(),
-            self.combining_class()
-        )
-        self.entities = (
-            self._char,
-            self._xchar(),
-            self._dchar(),
-            self._ochar(),
-            self._bchar(),
-            self._html_entity(),
-            self._dec_ncr(exclude_ascii=False, as_char=False),
-            self._hex_ncr(exclude_ascii=False, as_char=False)
-        )
+        self._name = None
+        self._data = None
+        self._entities = None
 
     def __str__(self):
         return self._char
 
     def __repr__(self):
         class_name = type(self).__name__
-        return f"{class_name}(char={self._char}, codepoint={self._cp}, name={self._name})"
+        return f"{class_name}(char={self._char}, codepoint={self._cp}, name={self.name()})"
+
+    @property
+    def data(self) -> tuple:
+        if self._data is None:
+            self._data = (
+                self._char,
+                self._cp,
+                self.name(),
+                self.script(),
+                self.block(),
+                self.general_category_code(),
+                self.bidi_class_code(),
+                self.combining_class()
+            )
+        return self._data
+
+    @property
+    def entities(self) -> tuple:
+        if self._entities is None:
+            self._entities = (
+                self._char,
+                self._xchar(),
+                self._dchar(),
+                self._ochar(),
+                self._bchar(),
+                self._html_entity(),
+                self._dec_ncr(exclude_ascii=False, as_char=False),
+                self._hex_ncr(exclude_ascii=False, as_char=False)
+            )
+        return self._entities
 
     def _get_property(self, property: int, short_name: bool = False) -> str | bool:
-        char = self._char
-        if property in BINARY_PROPERTIES:
-            return _icu.Char.hasBinaryProperty(char, property)
-
-        name_choice = 0 if short_name else 1
-        value = _icu.Char.getIntPropertyValue(char, property)
-        return _icu.Char.getPropertyValueName(property, value, name_choice)
+        return get_property(self._char, property, short_name)
 
     def _bchar(self):
         return bin(ord(self._char))
@@ -403,6 +440,8 @@ class UCD():
         return _icu.Char.charMirror(self._char)
 
     def name(self) -> str:
+        if self._name is None:
+            self._name = _icu.Char.charName(self._char)
         return self._name
 
     def name_alias(self):
@@ -411,10 +450,18 @@ class UCD():
     nfc_inert = _partialmethod(_get_property, property = _icu.UProperty.NFC_INERT, short_name = False)
     nfc_quick_check = _partialmethod(_get_property, property = _icu.UProperty.NFC_QUICK_CHECK, short_name = False)
 
+    def _decompositions_containing(self, uset, compatibility: bool) -> list[str]:
+        normalizer = _icu.Normalizer2.getNFKDInstance() if compatibility else _icu.Normalizer2.getNFDInstance()
+        index = _reverse_decomposition_index(compatibility)
+        # Characters outside the index decompose to themselves.
+        candidates = index.get(self._char, [])
+        if self._char not in _DECOMPOSABLE:
+            candidates = sorted([*candidates, self._char])
+        result = [item for item in candidates if uset.contains(item)]
+        return result + [item for item in uset.strings() if self._char in normalizer.normalize(item)]
+
     def nfd_contains(self, uset=_icu.UnicodeSet(r'[:Latin:]')) -> list[str]:
-        normalizer = _icu.Normalizer2.getNFDInstance()
-        domain = list(uset)
-        return [item for item in domain if self._char in normalizer.normalize(item)]
+        return self._decompositions_containing(uset, compatibility=False)
 
     nfd_inert = _partialmethod(_get_property, property = _icu.UProperty.NFD_INERT, short_name = False)
     nfd_quick_check = _partialmethod(_get_property, property = _icu.UProperty.NFD_QUICK_CHECK, short_name = False)
@@ -427,9 +474,7 @@ class UCD():
 
     def nfkd_contains(self, uset=_icu.UnicodeSet(r'[:Latin:]')) -> list[str]:
         # UCD('b').nfkd_contains(_icu.UnicodeSet(r'[:Any:]'))
-        normalizer = _icu.Normalizer2.getNFKDInstance()
-        domain = list(uset)
-        return [item for item in domain if self._char in normalizer.normalize(item)]
+        return self._decompositions_containing(uset, compatibility=True)
 
     nfkd_inert = _partialmethod(_get_property, property = _icu.UProperty.NFKD_INERT, short_name = False)
     nfkd_quick_check = _partialmethod(_get_property, property = _icu.UProperty.NFKD_QUICK_CHECK, short_name = False)
@@ -531,10 +576,14 @@ class UCD():
     xid_start = _partialmethod(_get_property, property = _icu.UProperty.XID_START, short_name = False)
 
 class UCDString():
+    # Code points are held in a compact array. Column accessors compute each
+    # value once per distinct code point and UCD objects are only created
+    # when data, entities or the per-character API is used.
+    _ucd_class = UCD
+
     def __init__(self, chars):
-        self._chars = [UCD(char) for char in chars]
-        self.data = [c.data for c in self._chars]
-        self.entities = [c.entities for c in self._chars]
+        self._cps = _array('I', map(ord, chars))
+        self._ucds = None
 
     def __str__(self):
         return "".join(self.characters())
@@ -544,40 +593,64 @@ class UCDString():
         return f"{class_name}(chars={self.characters()})"
 
     def __len__(self: _Self) -> int:
-        return len(self._chars)
+        return len(self._cps)
 
     def __getitem__(self: _Self, i) -> _Self:
         if isinstance(i, slice):
-            start, stop, step = i.indices(len(self))
-            return UCDString("".join([
-                self.data[index][0] for index in range(start, stop, step)
-            ]))
+            return type(self)("".join(map(chr, self._cps[i])))
         else:
-            return UCDString(self.data[i][0])
+            return type(self)(chr(self._cps[i]))
+
+    @property
+    def _chars(self) -> list[UCD]:
+        if self._ucds is None:
+            ucd_class = self._ucd_class
+            objects = {cp: ucd_class(chr(cp)) for cp in set(self._cps)}
+            self._ucds = [objects[cp] for cp in self._cps]
+        return self._ucds
+
+    @property
+    def data(self) -> list[tuple]:
+        return [c.data for c in self._chars]
+
+    @property
+    def entities(self) -> list[tuple]:
+        return [c.entities for c in self._chars]
+
+    def _column(self, fn) -> list:
+        values = {cp: fn(chr(cp)) for cp in set(self._cps)}
+        return [values[cp] for cp in self._cps]
 
     def ages(self):
-        return [c.age() for c in self._chars]
+        return self._column(_icu.Char.charAge)
 
     def blocks(self):
-        return [c.block() for c in self._chars]
+        return self.properties(_icu.UProperty.BLOCK)
 
     def characters(self):
-        return [c.character() for c in self._chars]
+        return list(map(chr, self._cps))
 
     def codepoints(self, decimal=False):
-        return [c.codepoint(decimal) for c in self._chars]
+        if decimal:
+            return self._cps.tolist()
+        return [f'{cp:04X}' for cp in self._cps]
 
     def in_set(self, uset):
-        return [c.in_set(uset) for c in self._chars]
+        uset = _icu.UnicodeSet(uset)
+        return self._column(uset.contains)
 
     def names(self):
-        return [c.name() for c in self._chars]
+        return self._column(_icu.Char.charName)
 
     def scripts(self):
-       return [c.script() for c in self._chars]
+        return self.properties(_icu.UProperty.SCRIPT)
 
     def properties(self, property, short_name = False):
-        return [c._get_property(property, short_name) for c in self._chars]
+        accessor = _tables.property_accessor(property, short_name)
+        if accessor is not None:
+            values = {cp: accessor(cp) for cp in set(self._cps)}
+            return [values[cp] for cp in self._cps]
+        return self._column(lambda char: get_property(char, property, short_name))
 
 
 
@@ -748,21 +821,123 @@ def uset_contains(chars:str, notation:str, mode:str='') -> bool:
         case _:
             return uset.contains(chars)
 
-def count_unicode_for_method(fn) -> int:
-    count = 0
-    for i in range(0x10FFFF + 1):
-        if fn(chr(i)):
-            count += 1
-    return count
-
-def get_unicode_chars_for_method(fn, cp: bool = False) -> list[str]:
-    chars = []
-    for i in range(0x10FFFF + 1):
-        if fn(chr(i)):
-            chars.append(chr(i))
+class _UCDMethodPredicate():
+    # Picklable wrapper so unbound UCD methods can be evaluated in worker processes.
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self, char):
+        return getattr(UCD(char), self.name)()
+
+def _ucd_method_name(fn) -> str | None:
+    target = getattr(fn, '_partialmethod', None) or getattr(fn, '__partialmethod__', None) or fn
+    for name, attr in vars(UCD).items():
+        if attr is target:
+            return name
+    return None
+
+def _predicate_uset(fn) -> _icu.UnicodeSet | None:
+    # Resolve predicates that ICU can answer as a set: UnicodeSets and
+    # patterns, binary properties, (property, value) pairs for enumerated
+    # properties and UCD methods wrapping a binary property.
+    if isinstance(fn, _icu.UnicodeSet):
+        return fn
+    if isinstance(fn, str):
+        return _icu.UnicodeSet(fn)
+    if isinstance(fn, tuple):
+        property, value = fn
+        if isinstance(value, str):
+            value = _icu.Char.getPropertyValueEnum(property, value)
+        return _icu.UnicodeSet().applyIntPropertyValue(property, value)
+    if isinstance(fn, int) and fn in BINARY_PROPERTIES:
+        return _icu.Char.getBinaryPropertySet(fn)
+    method = getattr(fn, '_partialmethod', None) or getattr(fn, '__partialmethod__', None)
+    if method is not None and method.func is UCD._get_property:
+        property = method.keywords.get('property')
+        if property in BINARY_PROPERTIES:
+            return _icu.Char.getBinaryPropertySet(property)
+    return None
+
+def _ranges_for_chunk(fn, start: int, stop: int) -> list[tuple[int, int]]:
+    ranges = []
+    run_start = None
+    for cp in range(start, stop):
+        if fn(chr(cp)):
+            if run_start is None:
+                run_start = cp
+        elif run_start is not None:
+            ranges.append((run_start, cp - 1))
+            run_start = None
+    if run_start is not None:
+        ranges.append((run_start, stop - 1))
+    return ranges
+
+def _merge_ranges(chunks) -> list[tuple[int, int]]:
+    merged = []
+    for ranges in chunks:
+        for start, end in ranges:
+            if merged and merged[-1][1] + 1 == start:
+                merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+    return merged
+
+def get_unicode_ranges_for_method(fn, processes: int | None = 1, chunk_size: int = 0x10000) -> list[tuple[int, int]]:
+    """Find the code points for which a predicate holds, as a compact range list.
+
+    Predicates ICU can answer directly are resolved with set algebra: a
+    UnicodeSet or UnicodeSet pattern, a binary property (e.g.
+    _icu.UProperty.ALPHABETIC), a (property, value) tuple for an enumerated
+    property (e.g. (_icu.UProperty.SCRIPT, 'Ethiopic')), or a UCD method
+    wrapping a binary property (e.g. UCD.alphabetic). Other UCD methods
+    (e.g. UCD.is_alpha) and arbitrary callables taking a single character
+    are evaluated in chunks, in the current process unless a process pool
+    is requested. Callables that cannot be pickled, such as lambdas, are
+    always evaluated in the current process. A process pool needs the
+    caller's main module to be importable under the spawn start method
+    (macOS, Windows), i.e. guarded by if __name__ == '__main__'.
+
+    Examples:
+        get_unicode_ranges_for_method(UCD.alphabetic)
+        get_unicode_ranges_for_method((_icu.UProperty.SCRIPT, 'Ethiopic'))
+        get_unicode_ranges_for_method(str.isdigit)
+        get_unicode_ranges_for_method(UCD.is_alpha, processes=None)
+
+    Args:
+        fn: Predicate to evaluate.
+        processes (int | None, optional): Number of worker processes for
+            callables, or None for the number of CPUs. Defaults to 1, which
+            evaluates in the current process.
+        chunk_size (int, optional): Code points per work item. Defaults to 0x10000.
+
+    Returns:
+        list[tuple[int, int]]: Sorted, non-adjacent (start, end) ranges, inclusive.
+    """
+    uset = _predicate_uset(fn)
+    if uset is not None:
+        return _merge_ranges([[(ord(start), ord(end)) for start, end in uset.ranges()]])
+    name = _ucd_method_name(fn)
+    if name is not None:
+        fn = _UCDMethodPredicate(name)
+    starts = range(0, 0x10FFFF + 1, chunk_size)
+    stops = [min(start + chunk_size, 0x10FFFF + 1) for start in starts]
+    try:
+        _pickle.dumps(fn)
+    except (_pickle.PicklingError, AttributeError, TypeError):
+        processes = 1
+    if processes == 1:
+        return _merge_ranges(_ranges_for_chunk(fn, start, stop) for start, stop in zip(starts, stops))
+    with _ProcessPoolExecutor(max_workers=processes) as executor:
+        return _merge_ranges(executor.map(_ranges_for_chunk, _repeat(fn), starts, stops))
+
+def count_unicode_for_method(fn, processes: int | None = 1) -> int:
+    return sum(end - start + 1 for start, end in get_unicode_ranges_for_method(fn, processes))
+
+def get_unicode_chars_for_method(fn, cp: bool = False, processes: int | None = 1) -> list[str]:
+    ranges = get_unicode_ranges_for_method(fn, processes)
     if cp:
-       return [f'{ord(ch):04X}' for ch in chars]
-    return chars
+       return [f'{i:04X}' for start, end in ranges for i in range(start, end + 1)]
+    return [chr(i) for start, end in ranges for i in range(start, end + 1)]
 
 def chars_to_codepoints(chars, decimal=False, enc='utf-8'):
     enc = enc.lower()
@@ -924,7 +1099,9 @@ def analyse_char(char: str, target: str = 'utf-8'):
     if len(char) > 1:
         print("anyalyse_char() only takes a single character as a string argument.")
         return None
-    print(f'\n{char} – {cp(char, prefix=True)} – {_unicodedataplus.name(char) if _unicodedataplus.name(char) else ""}\n')
+    def code_points(text):
+        return ' '.join(f'U+{ord(c):04X}' for c in text)
+    print(f'\n{char} – {code_points(char)} – {_icu.Char.charName(char) or ""}\n')
     table = []
     encodings = [
         'cp437', 'cp500', 'cp737', 'cp775', 'cp850',
@@ -938,13 +1115,15 @@ def analyse_char(char: str, target: str = 'utf-8'):
 
     for encoding in encodings:
         try:
-            data = [encoding, char.encode('latin-1').hex(' '), char.encode('latin-1').decode(encoding), cp(char.encode('latin-1').decode(encoding))]
-            table.append(data)
+            encoded = char.encode(target)
+            decoded = encoded.decode(encoding)
+            data = [encoding, encoded.hex(' '), decoded, code_points(decoded)]
         except UnicodeEncodeError:
-            data = [encoding, char.encode('latin-1').hex(' '), 'undef', 'undef']
+            data = [encoding, 'undef', 'undef', 'undef']
         except UnicodeDecodeError:
-            data = [encoding, char.encode('latin-1').hex(' '), 'undef', 'undef']
-    print(_tabulate(table, headers=["Encoding","Bytes as hex", "Bytes as chars"]))
+            data = [encoding, encoded.hex(' '), 'undef', 'undef']
+        table.append(data)
+    print(_tabulate(table, headers=["Encoding","Bytes as hex", "Bytes as chars", "Code points"]))
 
 
 # '\U0001F947'.encode('utf-8', 'surrogatepass').decode('utf-16')
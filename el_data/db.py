@@ -0,0 +1,226 @@
+"""
+Shared access to the package's SQLite database (data.db).
+
+All SQLite-backed classes read data.db through this module. Queries use
+bound parameters, so the sqlite3 statement cache can reuse compiled
+statements. Every query is timed into per-thread counters that are merged
+when read; see query_stats().
+
+Connections are pooled per thread and opened read-only with
+immutable=1, so SQLite takes no locks. By default each connection reads
+pages into its own page cache, without memory-mapped I/O. A
+thread's connection is held only in thread-local storage, so it is closed
+when the thread exits. Pooled connections are discarded in a child
+process after fork, so each process opens its own.
+
+In snapshot mode the whole file is memory-mapped instead and SQLite's
+private page cache is kept small, so processes reading data.db share the
+mapped pages through the OS page cache. Enable it with configure(snapshot=True)
+or by setting EL_DATA_DB_SNAPSHOT=1 before the first query.
+"""
+
+from functools import lru_cache as _lru_cache
+import logging as _logging
+import os as _os
+import os.path as _path
+from pathlib import Path as _Path
+import re as _re
+import sqlite3 as _sqlite3
+import threading as _threading
+import time as _time
+
+_logger = _logging.getLogger(__name__)
+
+DATA_DB = _path.join(_path.dirname(_path.abspath(__file__)), "data.db")
+# Number of compiled statements sqlite3 keeps per connection.
+STATEMENT_CACHE_SIZE = 256
+# Bytes of data.db each connection may access through mmap outside snapshot
+# mode. 0 disables mmap, so only snapshot mode maps the file.
+MMAP_SIZE = 0
+SNAPSHOT_ENV = 'EL_DATA_DB_SNAPSHOT'
+# Page cache per connection in snapshot mode, in KiB. Reads are served
+# from the mapping, so the cache only holds temporary b-tree pages.
+SNAPSHOT_CACHE_KIB = 256
+
+_snapshot = _os.environ.get(SNAPSHOT_ENV, '').lower() not in ('', '0', 'false', 'no')
+
+_local = _threading.local()
+_lock = _threading.Lock()
+# Incremented by close_connections(). A thread whose connection is from an
+# older generation closes it and opens a new one on its next query.
+_generation = 0
+# Query timings: each thread records into its own dict without locking.
+# Threads register their dict once; dicts of finished threads are folded
+# into _retired_stats.
+_thread_stats: list[tuple[_threading.Thread, dict[str, list]]] = []
+_retired_stats: dict[str, list] = {}
+_PLACEHOLDER_LIST = _re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+def _open() -> _sqlite3.Connection:
+    uri = f'{_Path(DATA_DB).as_uri()}?mode=ro&immutable=1'
+    conn = _sqlite3.connect(uri, uri=True, cached_statements=STATEMENT_CACHE_SIZE)
+    if _snapshot:
+        conn.execute(f'PRAGMA mmap_size = {_path.getsize(DATA_DB)}')
+        conn.execute(f'PRAGMA cache_size = -{int(SNAPSHOT_CACHE_KIB)}')
+        conn.execute('PRAGMA temp_store = MEMORY')
+    else:
+        conn.execute(f'PRAGMA mmap_size = {int(MMAP_SIZE)}')
+    _logger.debug("Connection established for thread %s: %s (snapshot=%s)", _threading.get_ident(), uri, _snapshot)
+    return conn
+
+def connection() -> _sqlite3.Connection:
+    """Return the calling thread's read-only connection to data.db, opening it on first use."""
+    local = _local
+    conn = getattr(local, 'connection', None)
+    if conn is not None and local.generation != _generation:
+        local.connection = None
+        conn.close()
+        conn = None
+    if conn is None:
+        generation = _generation
+        conn = local.connection = _open()
+        local.generation = generation
+    return conn
+
+def close_connections() -> None:
+    """Retire every pooled connection.
+
+    The calling thread's connection is closed now. Other threads close
+    their own before their next query and open a new one, so this is safe
+    while they are running queries.
+    """
+    global _generation
+    with _lock:
+        _generation += 1
+    conn = getattr(_local, 'connection', None)
+    if conn is not None:
+        _local.connection = None
+        conn.close()
+
+def configure(snapshot: bool | None = None) -> None:
+    """Change how data.db is opened.
+
+    Open connections are retired with close_connections(), so the new
+    settings apply from the next query in every thread.
+
+    Args:
+        snapshot (bool | None, optional): Memory-map the whole file and keep
+            a small page cache. None leaves the setting unchanged.
+    """
+    global _snapshot
+    if snapshot is not None:
+        _snapshot = bool(snapshot)
+    close_connections()
+
+def is_snapshot() -> bool:
+    return _snapshot
+
+def _reset_after_fork() -> None:
+    # SQLite connections must not be used across fork. The child drops the
+    # parent's connections without touching them and opens its own.
+    global _local, _lock, _thread_stats
+    _local = _threading.local()
+    _lock = _threading.Lock()
+    _thread_stats = []
+    _retired_stats.clear()
+
+if hasattr(_os, 'register_at_fork'):
+    _os.register_at_fork(after_in_child=_reset_after_fork)
+
+def quote_identifier(name: str) -> str:
+    """Quote a table or column name for interpolation into SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+@_lru_cache(maxsize=1024)
+def _normalise_query(query: str) -> str:
+    # IN (?, ?, ...) lists are bucketed by the next power of two, so batched
+    # queries of every length share a few entries.
+    def bucket(match):
+        return f'(?, ... <= {1 << (match.group().count("?") - 1).bit_length()})'
+    return _PLACEHOLDER_LIST.sub(bucket, query)
+
+def _merge_stats(target: dict[str, list], source: dict[str, list]) -> None:
+    # list() copies the items in one step, so the owning thread may keep
+    # recording while its dict is merged.
+    for query, (calls, total, longest) in list(source.items()):
+        stats = target.get(query)
+        if stats is None:
+            target[query] = [calls, total, longest]
+        else:
+            stats[0] += calls
+            stats[1] += total
+            stats[2] = max(stats[2], longest)
+
+def _retire_finished_threads() -> None:
+    # Called with _lock held.
+    live = []
+    for thread, stats in _thread_stats:
+        if thread.is_alive():
+            live.append((thread, stats))
+        else:
+            _merge_stats(_retired_stats, stats)
+    _thread_stats[:] = live
+
+def _thread_stats_dict() -> dict[str, list]:
+    stats = getattr(_local, 'stats', None)
+    if stats is None:
+        stats = _local.stats = {}
+        with _lock:
+            _retire_finished_threads()
+            _thread_stats.append((_threading.current_thread(), stats))
+    return stats
+
+def _record(query: str, elapsed: float) -> None:
+    stats = _thread_stats_dict()
+    key = _normalise_query(query)
+    entry = stats.get(key)
+    if entry is None:
+        entry = stats[key] = [0, 0.0, 0.0]
+    entry[0] += 1
+    entry[1] += elapsed
+    if elapsed > entry[2]:
+        entry[2] = elapsed
+    if _logger.isEnabledFor(_logging.DEBUG):
+        _logger.debug("%.3f ms: %s", elapsed * 1000, query)
+
+def fetchall(query: str, params=()) -> list[tuple]:
+    """Run a parameterised query and return all rows."""
+    start = _time.perf_counter()
+    rows = connection().execute(query, params).fetchall()
+    _record(query, _time.perf_counter() - start)
+    return rows
+
+def fetchone(query: str, params=()) -> tuple | None:
+    """Run a parameterised query and return the first row, or None."""
+    start = _time.perf_counter()
+    row = connection().execute(query, params).fetchone()
+    _record(query, _time.perf_counter() - start)
+    return row
+
+def query_stats() -> dict[str, dict[str, float]]:
+    """Per-query timing collected since the last reset, merged across threads.
+
+    Statements that differ only in the length of an IN (?, ...) list are
+    reported together, bucketed by the next power of two.
+
+    Returns:
+        dict[str, dict[str, float]]: For each SQL statement, the number of
+            calls and the total, mean and maximum latency in seconds.
+    """
+    with _lock:
+        _retire_finished_threads()
+        merged = {}
+        _merge_stats(merged, _retired_stats)
+        for _, stats in _thread_stats:
+            _merge_stats(merged, stats)
+    return {
+        query: {'calls': calls, 'total': total, 'mean': total / calls, 'max': longest}
+        for query, (calls, total, longest) in merged.items()
+    }
+
+def reset_query_stats() -> None:
+    with _lock:
+        _retire_finished_threads()
+        _retired_stats.clear()
+        for _, stats in _thread_stats:
+            stats.clear()
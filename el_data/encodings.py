@@ -1,34 +1,102 @@
 # import pandas as _pd
-# import numpy as _np
-import sqlite3 as _sqlite3
+from array import array as _array
+from collections import Counter as _Counter
+import os as _os
+import re as _re
 import icu as _icu
-import os.path as _path
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+from . import db as _db
+
+# Value stored in the decoded matrix for bytes an encoding leaves unmapped.
+UNMAPPED = 0xFFFFFFFF
+_SCHEMA = []
+_MATRIX = {}
+
+def _decode_value(value) -> int:
+    try:
+        return int(value, 16)
+    except (TypeError, ValueError):
+        return UNMAPPED
+
+def _encodings_columns() -> tuple[str, ...]:
+    # Column names of the encodings table, read once per process.
+    if not _SCHEMA:
+        _SCHEMA.append(tuple(column[1] for column in _db.fetchall("PRAGMA table_info('encodings')")))
+    return _SCHEMA[0]
+
+def _encodings_matrix() -> dict:
+    # The encodings table is 256 rows by one column per encoding. It is read
+    # once and kept as the raw rows, a row-major array of decoded code points
+    # (decoded[byte * len(encodings) + column]) and a reverse index from code
+    # point to (encoding, byte) pairs.
+    if not _MATRIX:
+        columns = _encodings_columns()
+        encodings = tuple(column for column in columns if column != 'codepoint')
+        rows = {}
+        decoded = _array('I', [UNMAPPED]) * (256 * len(encodings))
+        reverse = {}
+        for row in _db.fetchall('SELECT * FROM encodings;'):
+            record = dict(zip(columns, row))
+            byte = int(record['codepoint'], 16)
+            rows[byte] = row
+            for column, encoding in enumerate(encodings):
+                cp = _decode_value(record[encoding])
+                decoded[byte * len(encodings) + column] = cp
+                if cp != UNMAPPED:
+                    reverse.setdefault(cp, []).append((encoding, byte))
+        _MATRIX.update({
+            'columns': columns,
+            'encodings': encodings,
+            'rows': rows,
+            'decoded': decoded,
+            'reverse': reverse,
+            'reverse_sets': {cp: frozenset(encoding for encoding, _ in pairs) for cp, pairs in reverse.items()}
+        })
+    return _MATRIX
 
 class Encodings():
-    conn = None
     _collator = _icu.Collator.createInstance(_icu.Locale('und'))
     _collator.setAttribute(_icu.UCollAttribute.NUMERIC_COLLATION, _icu.UCollAttributeValue.ON)
 
+    _instances = {}
+
     def __init__(self, codepoint='0x00', encoding='iso-8859-1'):
-        BASE_DIR = _path.dirname(_path.abspath(__file__))
-        data_db = _path.join(BASE_DIR, "data.db")
-        if Encodings.conn is None:
-            try:
-                Encodings.conn = _sqlite3.connect(data_db)
-                Encodings.cursor = Encodings.conn.cursor()
-                print("Connection established")
-            except Exception as error:
-                print("Error: Connection not established {}".format(error))
-        else:
-            print("Existing connection")
         self._codepoint = self._normalise_codepoint(codepoint)
         self._encoding = encoding
-        self._available_8bit = self._available_encodings()
+        self._shared = False
         # self._python_encodings = _py_available_encodings()
 
-    def _available_encodings(self):
-        columns = Encodings.cursor.execute("PRAGMA table_info('encodings')").fetchall()
-        return [column[1] for column in columns if column[1] != 'codepoint']
+    @classmethod
+    def available_encodings(cls) -> tuple[str, ...]:
+        """Names of the 8-bit encodings in the encodings table, read once per process."""
+        return tuple(column for column in _encodings_columns() if column != 'codepoint')
+
+    @classmethod
+    def for_encoding(cls, encoding: str = 'iso-8859-1') -> 'Encodings':
+        """Return the shared instance for an encoding.
+
+        Shared instances are cached per process and never change: a code
+        point or encoding passed to their methods applies to that call only,
+        so they are safe to use from any thread. Instances created directly
+        remember the last code point and encoding passed to them.
+        """
+        encoding = encoding.lower()
+        instance = cls._instances.get(encoding)
+        if instance is None:
+            if encoding not in cls.available_encodings():
+                raise ValueError(f'Unknown encoding: {encoding}')
+            instance = cls(encoding=encoding)
+            instance._shared = True
+            instance = cls._instances.setdefault(encoding, instance)
+        return instance
+
+    @property
+    def _available_8bit(self) -> tuple[str, ...]:
+        return self.available_encodings()
 
     def _normalise_codepoint(self, codepoint=''):
         if isinstance(codepoint, int):
@@ -40,33 +108,455 @@ class Encodings():
     def _sorted(self, lst):
         return sorted(lst, key = Encodings._collator.getSortKey)
 
+    def _select_codepoint(self, codepoint) -> str:
+        if not codepoint:
+            return self._codepoint
+        codepoint = self._normalise_codepoint(codepoint)
+        if not self._shared:
+            self._codepoint = codepoint
+        return codepoint
+
     def codepoint_data(self, codepoint=''):
-        if codepoint:
-            self._codepoint = self._normalise_codepoint(codepoint)
-        query = f'SELECT * FROM encodings WHERE codepoint = "{self._codepoint}";'
-        Encodings.cursor.execute(query)
-        record = Encodings.cursor.fetchone()
-        data_keys = ['codepoint'] + self._available_8bit
-        return {data_keys[i]: record[i] for i in range(len(data_keys))}
+        codepoint = self._select_codepoint(codepoint)
+        matrix = _encodings_matrix()
+        record = matrix['rows'][int(codepoint, 16)]
+        return dict(zip(matrix['columns'], record))
 
     def encoding_data(self, enc=''):
-        if enc:
-            self._encoding = enc.lower()
-        query = f'SELECT "{self._encoding}" FROM encodings;'
-        Encodings.cursor.execute(query)
-        records = Encodings.cursor.fetchall()
-        results = [*enumerate([r[0] for r in records])]
-        return {f'0x{i[0]:02X}': i[1] for i in results}
+        encoding = enc.lower() if enc else self._encoding
+        if enc and not self._shared:
+            self._encoding = encoding
+        if encoding not in self._available_8bit:
+            raise ValueError(f'Unknown encoding: {encoding}')
+        matrix = _encodings_matrix()
+        column = matrix['columns'].index(encoding)
+        return {f'0x{byte:02X}': row[column] for byte, row in sorted(matrix['rows'].items())}
 
     def match_character(self, character, codepoint='', ):
-        if codepoint:
-            self._codepoint = self._normalise_codepoint(codepoint)
-        character_codepoint = f'0x{ord(character):04X}'
-        record = self.codepoint_data(self._codepoint)
-        data = list({k for k, v in record.items() if v == character_codepoint})
+        codepoint = self._select_codepoint(codepoint)
+        byte = int(codepoint, 16)
+        data = [encoding for encoding, b in _encodings_matrix()['reverse'].get(ord(character), ()) if b == byte]
         return self._sorted(data)
 
+    def lookup_character(self, character):
+        """Encodings that can represent a character, with the byte each uses.
+
+        Returns:
+            list[tuple[str, str]]: (encoding, byte) pairs, e.g. ('windows-1252', '0xE9'),
+                sorted by encoding.
+        """
+        pairs = _encodings_matrix()['reverse'].get(ord(character), ())
+        return sorted(((encoding, f'0x{byte:02X}') for encoding, byte in pairs), key=lambda pair: Encodings._collator.getSortKey(pair[0]))
+
+def encodings_for_string(text: str) -> list[str]:
+    """Legacy 8-bit encodings that can represent every character in text.
+
+    Returns:
+        list[str]: Encoding names, sorted.
+    """
+    reverse_sets = _encodings_matrix()['reverse_sets']
+    candidates = None
+    for char in set(text):
+        encodings = reverse_sets.get(ord(char), frozenset())
+        candidates = encodings if candidates is None else candidates & encodings
+        if not candidates:
+            return []
+    if candidates is None:
+        candidates = _encodings_matrix()['encodings']
+    return sorted(candidates, key=Encodings._collator.getSortKey)
+
+
+
+# Plausibility of a decoded character, by general category, used to score
+# how likely an encoding produced a byte stream. Running text is mostly
+# lowercase, so uppercase letters score a little lower. Bytes an encoding
+# leaves unmapped score UNMAPPED_WEIGHT.
+_CATEGORY_WEIGHTS = {
+    _icu.UCharCategory.UPPERCASE_LETTER: 0.6,
+    _icu.UCharCategory.LOWERCASE_LETTER: 1.0,
+    _icu.UCharCategory.TITLECASE_LETTER: 0.6,
+    _icu.UCharCategory.MODIFIER_LETTER: 0.5,
+    _icu.UCharCategory.OTHER_LETTER: 1.0,
+    _icu.UCharCategory.NON_SPACING_MARK: 0.5,
+    _icu.UCharCategory.COMBINING_SPACING_MARK: 0.5,
+    _icu.UCharCategory.ENCLOSING_MARK: 0.0,
+    _icu.UCharCategory.DECIMAL_DIGIT_NUMBER: 0.5,
+    _icu.UCharCategory.LETTER_NUMBER: 0.25,
+    _icu.UCharCategory.OTHER_NUMBER: 0.25,
+    _icu.UCharCategory.SPACE_SEPARATOR: 0.5,
+    _icu.UCharCategory.LINE_SEPARATOR: -1.0,
+    _icu.UCharCategory.PARAGRAPH_SEPARATOR: -1.0,
+    _icu.UCharCategory.CONTROL_CHAR: -2.0,
+    _icu.UCharCategory.FORMAT_CHAR: -1.0,
+    _icu.UCharCategory.PRIVATE_USE_CHAR: -2.0,
+    _icu.UCharCategory.SURROGATE: -5.0,
+    _icu.UCharCategory.GENERAL_OTHER_TYPES: -5.0,
+    _icu.UCharCategory.MATH_SYMBOL: 0.0,
+    _icu.UCharCategory.CURRENCY_SYMBOL: 0.25,
+    _icu.UCharCategory.MODIFIER_SYMBOL: 0.0,
+    _icu.UCharCategory.OTHER_SYMBOL: 0.0,
+}
+_WHITESPACE_CONTROLS = {0x09, 0x0A, 0x0D}
+UNMAPPED_WEIGHT = -5.0
+# Weight of script coherence relative to the mean character weight.
+COHERENCE_WEIGHT = 1.0
+SCORE_CHUNK_SIZE = 1 << 20
+_PROFILES = {}
+
+def _character_weight(cp: int) -> float:
+    if cp == UNMAPPED:
+        return UNMAPPED_WEIGHT
+    if cp in _WHITESPACE_CONTROLS:
+        return 0.5
+    return _CATEGORY_WEIGHTS.get(_icu.Char.charType(cp), 0.25)
+
+def _letter_script(cp: int) -> int | None:
+    if cp == UNMAPPED or not _icu.Char.isalpha(cp):
+        return None
+    return _icu.Char.getIntPropertyValue(cp, _icu.UProperty.SCRIPT)
+
+def _encoding_profile(encodings: tuple[str, ...]) -> dict:
+    # For a set of candidate encodings: the bytes all of them decode to the
+    # same character (such as ASCII), which cannot change the ranking and
+    # are not counted; the letters among those bytes, grouped by script;
+    # and for each encoding the weight and letter script of every byte.
+    profile = _PROFILES.get(encodings)
+    if profile is None:
+        matrix = _encodings_matrix()
+        width = len(matrix['encodings'])
+        decoded = {
+            encoding: [matrix['decoded'][byte * width + matrix['encodings'].index(encoding)] for byte in range(256)]
+            for encoding in encodings
+        }
+        uniform = [byte for byte in range(256) if len({cps[byte] for cps in decoded.values()}) == 1]
+        shared_letters = {}
+        if encodings:
+            first = decoded[encodings[0]]
+            for byte in uniform:
+                script = _letter_script(first[byte])
+                if script is not None:
+                    shared_letters.setdefault(script, bytearray()).append(byte)
+        profile = _PROFILES[encodings] = {
+            'uniform': bytes(uniform),
+            'shared_letters': {script: bytes(letters) for script, letters in shared_letters.items()},
+            'weights': {encoding: [_character_weight(cp) for cp in cps] for encoding, cps in decoded.items()},
+            'scripts': {encoding: [_letter_script(cp) for cp in cps] for encoding, cps in decoded.items()}
+        }
+    return profile
+
+def _read_chunks(source, chunk_size: int):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = bytes(source) if not isinstance(source, bytes) else source
+        for offset in range(0, len(source), chunk_size):
+            yield source[offset:offset + chunk_size]
+    elif isinstance(source, (str, _os.PathLike)):
+        with open(source, 'rb') as f:
+            yield from iter(lambda: f.read(chunk_size), b'')
+    else:
+        yield from iter(lambda: source.read(chunk_size), b'')
+
+def _histogram(chunks, skip: bytes = b'') -> tuple[list[int], int]:
+    # numpy.bincount counts each chunk in one C pass. Without numpy, skipped
+    # bytes are deleted first and the rest are counted with Counter.
+    total = 0
+    if _np is not None:
+        counts = _np.zeros(256, dtype=_np.int64)
+        for chunk in chunks:
+            total += len(chunk)
+            counts += _np.bincount(_np.frombuffer(chunk, dtype=_np.uint8), minlength=256)
+        histogram = counts.tolist()
+        for byte in skip:
+            histogram[byte] = 0
+        return histogram, total
+    counts = _Counter()
+    for chunk in chunks:
+        total += len(chunk)
+        counts.update(chunk.translate(None, skip) if skip else chunk)
+    return [counts.get(byte, 0) for byte in range(256)], total
+
+def byte_histogram(source, chunk_size: int = SCORE_CHUNK_SIZE, skip: bytes = b'') -> tuple[list[int], int]:
+    """Count byte values in a buffer, file or binary stream, reading it in chunks.
+
+    Counting is done with numpy if it is installed, which is several times faster.
+
+    Args:
+        source (bytes | str | PathLike | BinaryIO): Data, a file path or a binary file object.
+        chunk_size (int, optional): Bytes read at a time. Defaults to SCORE_CHUNK_SIZE.
+        skip (bytes, optional): Byte values to leave uncounted. Defaults to b''.
+
+    Returns:
+        tuple[list[int], int]: Counts indexed by byte value, and the total number of bytes read.
+    """
+    return _histogram(_read_chunks(source, chunk_size), skip)
+
+def score_encodings(source, encodings=None, chunk_size: int = SCORE_CHUNK_SIZE, top: int | None = None) -> list[dict]:
+    """Rank 8-bit encodings by how plausibly they decode a byte stream.
+
+    The stream is read in chunks into a histogram of the bytes the
+    candidate encodings decode differently. Each encoding is scored on
+
+    * the mean plausibility, by general category, of the characters it
+      decodes those bytes to, and
+    * script coherence: the share of letters in the dominant script. Letters
+      of a script the encodings share (Latin, via ASCII) are expected to be
+      mostly the shared ones, so a decoding that turns text into mostly
+      accented Latin letters scores low.
 
+    This is a unigram heuristic for triage. Closely related encodings that
+    differ only in rarely used bytes may tie.
+
+    Args:
+        source (bytes | str | PathLike | BinaryIO): Data, a file path or a binary file object.
+        encodings (Iterable[str] | None, optional): Encodings to score. Defaults to all
+            encodings in the encodings table.
+        chunk_size (int, optional): Bytes read at a time. Defaults to SCORE_CHUNK_SIZE.
+        top (int | None, optional): Number of results to return. Defaults to all.
+
+    Returns:
+        list[dict]: Best first, 'encoding', 'score', 'coherence', 'unmapped' (bytes the
+            encoding cannot decode), 'evidence' (distinguishing bytes counted) and 'bytes'.
+    """
+    available = _encodings_matrix()['encodings']
+    encodings = available if encodings is None else tuple(dict.fromkeys(encodings))
+    for encoding in encodings:
+        if encoding not in available:
+            raise ValueError(f'Unknown encoding: {encoding}')
+    profile = _encoding_profile(encodings)
+    shared = dict.fromkeys(profile['shared_letters'], 0)
+    if _np is not None:
+        # The full histogram also gives the shared letter counts.
+        counts, total = _histogram(_read_chunks(source, chunk_size))
+        for script, letters in profile['shared_letters'].items():
+            shared[script] = sum(counts[byte] for byte in letters)
+        for byte in profile['uniform']:
+            counts[byte] = 0
+    else:
+        def chunks():
+            for chunk in _read_chunks(source, chunk_size):
+                for script, letters in profile['shared_letters'].items():
+                    shared[script] += len(chunk) - len(chunk.translate(None, letters))
+                yield chunk
+        counts, total = _histogram(chunks(), profile['uniform'])
+    observed = [(byte, count) for byte, count in enumerate(counts) if count]
+    evidence = sum(count for _, count in observed)
+    results = []
+    for encoding in encodings:
+        weights, scripts = profile['weights'][encoding], profile['scripts'][encoding]
+        letters = dict(shared)
+        for byte, count in observed:
+            if scripts[byte] is not None:
+                letters[scripts[byte]] = letters.get(scripts[byte], 0) + count
+        all_letters = sum(letters.values())
+        coherence = 0.0
+        if all_letters:
+            effective = (
+                shared[script] + min(count - shared[script], shared[script] // 2) if script in shared else count
+                for script, count in letters.items()
+            )
+            coherence = max(effective) / all_letters
+        mean = sum(weights[byte] * count for byte, count in observed) / evidence if evidence else 0.0
+        results.append({
+            'encoding': encoding,
+            'score': mean + COHERENCE_WEIGHT * coherence,
+            'coherence': coherence,
+            'unmapped': sum(count for byte, count in observed if weights[byte] == UNMAPPED_WEIGHT),
+            'evidence': evidence,
+            'bytes': total
+        })
+    results.sort(key=lambda result: (-result['score'], result['unmapped'], Encodings._collator.getSortKey(result['encoding'])))
+    return results[:top] if top is not None else results
+
+# Double-encoded UTF-8: UTF-8 bytes that were decoded with a legacy
+# encoding. Runs of characters that map back to a UTF-8 lead byte and its
+# continuation bytes are found with a per-encoding regex, mapped back to
+# bytes with str.translate and decoded as UTF-8.
+_MOJIBAKE_PREFERENCE = ('windows-1252', 'iso-8859-1', 'iso-8859-15', 'windows-1250', 'iso-8859-2', 'windows-1251', 'mac-roman', 'cp437', 'cp850')
+_MOJIBAKE = {}
+
+def _char_class(chars) -> str:
+    return '[' + ''.join(_re.escape(char) for char in sorted(chars)) + ']'
+
+def _mojibake_codec(encoding: str) -> tuple:
+    codec = _MOJIBAKE.get(encoding)
+    if codec is None:
+        matrix = _encodings_matrix()
+        width = len(matrix['encodings'])
+        column = matrix['encodings'].index(encoding)
+        to_byte = {}
+        for byte in range(0x80, 0x100):
+            cp = matrix['decoded'][byte * width + column]
+            if cp != UNMAPPED:
+                to_byte.setdefault(chr(cp), byte)
+        # Bytes the encoding leaves unmapped often pass through as the C1
+        # control or Latin-1 character with the same value.
+        for byte in range(0x80, 0x100):
+            if byte not in to_byte.values() and chr(byte) not in to_byte:
+                to_byte[chr(byte)] = byte
+        def chars(low, high):
+            return [char for char, byte in to_byte.items() if low <= byte <= high]
+        cont = _char_class(chars(0x80, 0xBF))
+        pattern = _re.compile(
+            f'(?:{_char_class(chars(0xC2, 0xDF))}{cont}'
+            f'|{_char_class(chars(0xE0, 0xEF))}{cont}{{2}}'
+            f'|{_char_class(chars(0xF0, 0xF4))}{cont}{{3}})+'
+        )
+        table = str.maketrans({char: chr(byte) for char, byte in to_byte.items()})
+        codec = _MOJIBAKE[encoding] = (pattern, table, frozenset(chars(0xC2, 0xF4)))
+    return codec
+
+def _mojibake_candidates(encodings) -> tuple[str, ...]:
+    available = _encodings_matrix()['encodings']
+    if encodings is None:
+        return tuple(dict.fromkeys([encoding for encoding in _MOJIBAKE_PREFERENCE if encoding in available] + list(available)))
+    if isinstance(encodings, str):
+        encodings = (encodings,)
+    candidates = tuple(dict.fromkeys(encoding.lower() for encoding in encodings))
+    for encoding in candidates:
+        if encoding not in available:
+            raise ValueError(f'Unknown encoding: {encoding}')
+    if not candidates:
+        raise ValueError('No candidate encodings given.')
+    return candidates
+
+# Mojibake only ever consists of non-ASCII characters. Text is split once
+# into ASCII and non-ASCII runs, and detection and repair work on the
+# distinct non-ASCII runs. Detection in repair_mojibake() looks at no more
+# than MOJIBAKE_SAMPLE_SIZE characters of distinct runs.
+_NON_ASCII_RUN = _re.compile(r'([^\x00-\x7f]+)')
+MOJIBAKE_SAMPLE_SIZE = 1 << 16
+
+def _split_runs(text: str) -> tuple[list[str], _Counter]:
+    # split() puts the non-ASCII runs at odd indices.
+    parts = _NON_ASCII_RUN.split(text)
+    return parts, _Counter(parts[1::2])
+
+def _sample_runs(runs: _Counter, size: int = MOJIBAKE_SAMPLE_SIZE) -> _Counter:
+    sample = _Counter()
+    length = 0
+    for run, count in runs.items():
+        if length >= size:
+            break
+        sample[run] = count
+        length += len(run)
+    return sample
+
+def _repair_segment(segment: str, table: dict) -> str | None:
+    try:
+        return segment.translate(table).encode('latin-1').decode('utf-8')
+    except UnicodeError:
+        return None
+
+def _is_evidence(segment: str, repaired: str) -> bool:
+    # Genuine text rarely contains a run that happens to be valid UTF-8, but
+    # it can (e.g. 'ÀÉ' in mac-roman). Only runs containing a non-letter, or
+    # that repair to more than one character, count towards detection.
+    return len(repaired) > 1 or not segment.isalpha()
+
+def _detect_runs(runs: _Counter, candidates: tuple[str, ...]) -> list[tuple[str, int]]:
+    present = set(''.join(runs))
+    results = []
+    for encoding in candidates:
+        pattern, table, leads = _mojibake_codec(encoding)
+        if present.isdisjoint(leads):
+            continue
+        repaired = 0
+        for run, count in runs.items():
+            for match in pattern.finditer(run):
+                segment = match.group()
+                fixed = _repair_segment(segment, table)
+                if fixed is not None and _is_evidence(segment, fixed):
+                    repaired += len(segment) * count
+        if repaired:
+            results.append((encoding, repaired))
+    results.sort(key=lambda result: -result[1])
+    return results
+
+def _repair_runs(text: str, parts: list[str], runs: _Counter, encoding: str) -> str:
+    pattern, table, leads = _mojibake_codec(encoding)
+    def repair(match):
+        repaired = _repair_segment(match.group(), table)
+        return match.group() if repaired is None else repaired
+    fixes = {}
+    for run in runs:
+        if not leads.isdisjoint(run):
+            fixed = pattern.sub(repair, run)
+            if fixed != run:
+                fixes[run] = fixed
+    if not fixes:
+        return text
+    parts[1::2] = map(fixes.get, parts[1::2], parts[1::2])
+    return ''.join(parts)
+
+def detect_mojibake(text: str, encodings=None) -> list[tuple[str, int]]:
+    """Legacy encodings under which text contains double-encoded UTF-8.
+
+    Args:
+        text (str): Text to examine.
+        encodings (str | Iterable[str] | None, optional): Candidate encodings.
+            Defaults to all encodings in the encodings table.
+
+    Raises:
+        ValueError: An encoding is not in the encodings table, or none were given.
+
+    Returns:
+        list[tuple[str, int]]: (encoding, characters repaired) pairs, most first.
+    """
+    candidates = _mojibake_candidates(encodings)
+    if text.isascii():
+        return []
+    return _detect_runs(_split_runs(text)[1], candidates)
+
+def repair_mojibake(text: str, encodings=None) -> str:
+    """Repair UTF-8 text that was mis-decoded with a legacy 8-bit encoding.
+
+    For example 'cafÃ©' (UTF-8 read as windows-1252) becomes 'café'. Only
+    runs that form valid UTF-8 when mapped back to bytes are replaced; the
+    rest of the text is left untouched. When the encoding is detected, text
+    is only changed if it contains runs that are clearly mojibake.
+
+    Args:
+        text (str): Text to repair.
+        encodings (str | Iterable[str] | None, optional): Encoding, or candidate
+            encodings, the text was mis-decoded with. If several are given, the
+            one that repairs the most characters in a sample of the text is
+            used. Defaults to all encodings in the encodings table.
+
+    Raises:
+        ValueError: An encoding is not in the encodings table, or none were given.
+
+    Returns:
+        str: Repaired text.
+    """
+    candidates = _mojibake_candidates(encodings)
+    if text.isascii():
+        return text
+    parts, runs = _split_runs(text)
+    if len(candidates) > 1:
+        detected = _detect_runs(_sample_runs(runs), candidates)
+        if not detected:
+            return text
+        candidates = (detected[0][0],)
+    return _repair_runs(text, parts, runs, candidates[0])
+
+def repair_mojibake_iter(texts, encodings=None):
+    """Apply repair_mojibake() to each text in an iterable, lazily.
+
+    When several candidate encodings are given, the encoding is detected
+    from the first text that contains mojibake and used for every later text.
+    """
+    candidates = _mojibake_candidates(encodings)
+    for text in texts:
+        if text.isascii():
+            yield text
+            continue
+        parts, runs = _split_runs(text)
+        if len(candidates) > 1:
+            detected = _detect_runs(_sample_runs(runs), candidates)
+            if not detected:
+                yield text
+                continue
+            candidates = (detected[0][0],)
+        yield _repair_runs(text, parts, runs, candidates[0])
 
 def get_surrogate_pair(char, as_int=False, as_char=False):
     char = chr(char) if isinstance(char, int) else char
@@ -83,15 +573,51 @@ def get_surrogate_pair(char, as_int=False, as_char=False):
 # print(get_surrogate_pair(0x10000, True))
 # print(get_surrogate_pair('𐀀', as_char=True))
 
+_NON_BMP_PATTERNS = {
+    False: r'[[[\p{Any}]-[\u0000-\uFFFF]]-[\p{Unassigned}]]',
+    True: r'[[\p{Emoji}]-[\u0000-\uFFFF]]'
+}
+_SURROGATE_INDEXES = {}
+
+def _surrogate_index(emoji_only: bool = False) -> dict[int, _array]:
+    # Map each lead and trail surrogate to the code points, in code point
+    # order, whose UTF-16 form starts or ends with it. Built once per set.
+    index = _SURROGATE_INDEXES.get(emoji_only)
+    if index is None:
+        index = {}
+        non_bmp = _icu.UnicodeSet(_NON_BMP_PATTERNS[emoji_only])
+        for start, end in non_bmp.ranges():
+            start, end = ord(start), ord(end)
+            # Lead surrogates cover contiguous blocks of 1024 code points.
+            for block in range(start >> 10, (end >> 10) + 1):
+                lead = 0xD800 + block - 0x40
+                low, high = max(start, block << 10), min(end, (block << 10) | 0x3FF)
+                index.setdefault(lead, _array('I')).extend(range(low, high + 1))
+            for cp in range(start, end + 1):
+                index.setdefault(0xDC00 | (cp & 0x3FF), _array('I')).append(cp)
+        _SURROGATE_INDEXES[emoji_only] = index
+    return index
+
 def explore_surrogates(surrogate_char, emoji_only=False):
     surrogate_char = chr(surrogate_char) if isinstance(surrogate_char, int) else surrogate_char
     if not 0xD800 <= ord(surrogate_char) <= 0xDFFF:
         return None
-    non_bmp = _icu.UnicodeSet(r'[[\p{Emoji}]-[\u0000-\uFFFF]]') if emoji_only else _icu.UnicodeSet(r'[[[\p{Any}]-[\u0000-\uFFFF]]-[\p{Unassigned}]]')
-    surrogate_byte = surrogate_char.encode('utf-16-be', 'surrogatepass')
-    if 0xD800 <= ord(surrogate_char) <= 0xDBFF:
-        return [e for e in list(non_bmp) if e.encode('utf-16-be').startswith(surrogate_byte)]
-    return [e for e in list(non_bmp) if e.encode('utf-16-be').endswith(surrogate_byte)]
+    return [chr(cp) for cp in _surrogate_index(emoji_only).get(ord(surrogate_char), ())]
+
+def explore_surrogates_bulk(surrogate_chars, emoji_only=False):
+    """Apply explore_surrogates() to many lead and/or trail surrogates.
+
+    Args:
+        surrogate_chars (Iterable[str|int]): Surrogates as characters or integers.
+        emoji_only (bool, optional): Restrict results to emoji. Defaults to False.
+
+    Returns:
+        dict[str, list[str]|None]: Results keyed by surrogate character.
+    """
+    return {
+        (chr(s) if isinstance(s, int) else s): explore_surrogates(s, emoji_only)
+        for s in surrogate_chars
+    }
 
 # len(explore_surrogates('\ud83d'))
 # len(explore_surrogates('\ud83d', True))
@@ -1,11 +1,13 @@
 import icu as _icu
-import sqlite3 as _sqlite3
 from functools import partialmethod as _partialmethod
+from functools import lru_cache as _lru_cache
+import json as _json
+import re as _re
 from rich.console import Console as _Console
 from rich.table import Table as _Table, box as _box
+from . import db as _db
 from .data import UCD, UCDString, BINARY_PROPERTIES, BLOCKS
 # from .cldr import CLDR
-import os.path as _path
 try:
   from typing import Self as _Self
 except ImportError:
@@ -200,9 +202,22 @@ homophonic_family_equivalences = {
     }
 }
 
-class EthiopicUCD(UCD):
+_MATRIX = {}
+
+def _ethiopic_matrix() -> dict:
+    # The ethiopic table is a fixed family × order grid of syllables. It is
+    # read once and kept as syllable -> (family, order), family -> {order:
+    # syllable} and order -> [syllables], in table order.
+    if not _MATRIX:
+        syllables, families, orders = {}, {}, {}
+        for syllable, family, order in _db.fetchall("SELECT ሆሄ, ቤተሰብ, ቤት FROM ethiopic"):
+            syllables[syllable] = (family, order)
+            families.setdefault(family, {})[order] = syllable
+            orders.setdefault(order, []).append(syllable)
+        _MATRIX.update({'syllables': syllables, 'families': families, 'orders': orders})
+    return _MATRIX
 
-    conn = None
+class EthiopicUCD(UCD):
 
     CHARACTERS = _icu.UnicodeSet(r'[\p{Ethiopic}]')
     SYLLABLES = _icu.UnicodeSet(r'[[\p{Ethiopic}]&[\p{L}]]')
@@ -285,50 +300,17 @@ class EthiopicUCD(UCD):
     }
 
     def __init__(self, char):
-      BASE_DIR = _path.dirname(_path.abspath(__file__))
-      data_db = _path.join(BASE_DIR, "data.db")
-      if EthiopicUCD.conn is None:
-         try:
-            EthiopicUCD.conn = _sqlite3.connect(data_db)
-            EthiopicUCD.cursor = EthiopicUCD.conn.cursor()
-         except Exception as error:
-            print("Error: Connection not established {}".format(error))
-         # else:
-         #    print("Connection established")
-      self._char = char
-      self._name = _icu.Char.charName(self._char)
-      self._cp = f'{ord(self._char):04X}'
+      super().__init__(char)
       self._family, self._order = self._order_family()
-      self.data = (
-            self._char,
-            self._cp,
-            self._name,
-            self.script(),
-            self.block(),
-            self.general_category_code(),
-            self.bidi_class_code(),
-            self.combining_class()
-      )
-      self.entities = (
-            self._char,
-            self._xchar(),
-            self._dchar(),
-            self._ochar(),
-            self._bchar(),
-            self._html_entity(),
-            self._dec_ncr(exclude_ascii=False, as_char=False),
-            self._hex_ncr(exclude_ascii=False, as_char=False)
-        )
 
     def _order_family(self: _Self):
         if self._char in self.SYLLABLES:
-            query = f"SELECT ቤተሰብ, ቤት FROM ethiopic WHERE ሆሄ = '{self._char}'"
-            return EthiopicUCD.cursor.execute(query).fetchall()[0]
+            return _ethiopic_matrix()['syllables'].get(self._char, (None, None))
         return (None, None)
 
     def is_ethiopic_numeral(self: _Self, ethNumber: str) -> bool:
         # return 0x1369 <= ord(ethNumber) <= 0x137C
-        return ethNumber in self.NUMERALS
+        return ethNumber in self.NUMBERS
 
     def get_family(self: _Self, mode: str = 'default') -> str:
         if mode.lower() == 'label':
@@ -338,9 +320,7 @@ class EthiopicUCD(UCD):
         return self._family
 
     def get_family_members(self: _Self) -> list[str]:
-        query = f"SELECT ሆሄ FROM ethiopic WHERE ቤተሰብ = '{self._family}'"
-        result = EthiopicUCD.cursor.execute(query).fetchall()
-        return [t[0] for t in result]
+        return list(_ethiopic_matrix()['families'].get(self._family, {}).values())
 
     def get_family_pattern(self: _Self) -> str:
         uset = self.get_family_uset()
@@ -358,9 +338,7 @@ class EthiopicUCD(UCD):
         return self._order
 
     def get_order_members(self: _Self) -> list[str]:
-        query = f"SELECT ሆሄ FROM ethiopic WHERE ቤት = '{self._order}'"
-        result = EthiopicUCD.cursor.execute(query).fetchall()
-        return [t[0] for t in result]
+        return list(_ethiopic_matrix()['orders'].get(self._order, ()))
 
     def get_order_pattern(self: _Self) -> str:
         uset = self.get_order_uset()
@@ -371,27 +349,13 @@ class EthiopicUCD(UCD):
         return _icu.UnicodeSet(pattern)
 
     def convert_order(self: _Self, order:str) -> str:
-        query = f'SELECT ሆሄ FROM ethiopic WHERE ቤተሰብ = "{self._family}" and ቤት = "{order}";'
-        return EthiopicUCD.cursor.execute(query).fetchone()[0]
+        syllable = _ethiopic_matrix()['families'].get(self._family, {}).get(order)
+        if syllable is None:
+            raise ValueError(f'{self._char} has no {order} form.')
+        return syllable
 
 class EthiopicUCDString(UCDString):
-    def __init__(self: _Self, chars: str):
-        self._chars = [EthiopicUCD(char) for char in chars]
-        self.data = [c.data for c in self._chars]
-        self.entities = [c.entities for c in self._chars]
-
-    def __len__(self: _Self) -> int:
-        return len(self._chars)
-
-    def __getitem__(self: _Self, i) -> _Self:
-        if isinstance(i, slice):
-            start, stop, step = i.indices(len(self))
-            return EthiopicUCDString("".join([
-                self.data[index][0] for index in range(start, stop, step)
-            ]))
-        else:
-            # return EthiopicUCD(self.data[i][0])
-            return EthiopicUCDString(self.data[i][0])
+    _ucd_class = EthiopicUCD
 
     def get_family(self: _Self, mode: str = 'default') -> list[str]:
         """_summary_
@@ -428,8 +392,8 @@ class EthiopicUCDString(UCDString):
         """
         if len(ethNumber) == 1:
             # return 0x1369 <= ord(ethNumber) <= 0x137C
-            return ethNumber in EthiopicUCD.NUMERALS
-        return set(ethNumber).issubset(EthiopicUCD.NUMERALS)
+            return ethNumber in EthiopicUCD.NUMBERS
+        return EthiopicUCD.NUMBERS.containsAll(ethNumber)
 
     def convert_order(self: _Self, order, idx: int|None = None, as_string: bool = False) -> list[str] | str:
         """Convert each syllable, or syllable at index, to the corresponding syllable of the specified order.
@@ -463,11 +427,116 @@ class EthiopicUCDString(UCDString):
 #         raise ValueError("Input must be a single character")
 #     return EthiopicUCD(char).get_order_members()
 
+_ORDER_EXAMPLES = {
+    1: 'መ', 2 : 'ሙ', 3 : 'ሚ', 4 : 'ማ', 5 : 'ሜ',
+    6 : 'ም', 7 : 'ሞ', 8 : 'ⶁ', 9 : 'ᎀ', 10 : 'ᎁ',
+    11 : 'ሟ', 12 : 'ᎂ', 13 : 'ᎃ', 14 : 'ፙ'
+}
+_SELECTIONS = {}
+_SELECTION_PATTERNS = {}
+
+def _order_names(orders: int|str) -> list[str]:
+    # Order numbers, e.g. '1-3,7', to order names as stored in the ethiopic table.
+    if isinstance(orders, int):
+        if not 0 < orders < 15:
+            raise ValueError('Input must be an integer between 1 and 14')
+        orders = [orders]
+    else:
+        orders = expand_range(str(orders))
+    syllables = _ethiopic_matrix()['syllables']
+    names = []
+    for order in orders:
+        if order not in _ORDER_EXAMPLES:
+            raise ValueError('Orders must be integers between 1 and 14')
+        name = syllables.get(_ORDER_EXAMPLES[order], (None, None))[1]
+        if name is not None:
+            names.append(name)
+    return names
+
+def _family_names(families: str) -> list[str]:
+    if len(families) == 1:
+        family = _ethiopic_matrix()['syllables'].get(families, (None, None))[0]
+        return [] if family is None else [family]
+    return expand_range(families)
+
+def _selection(families: str|None = None, orders: int|str|None = None) -> list[str]:
+    if families is None and orders is None:
+        raise ValueError('Specify families, orders or both.')
+    matrix = _ethiopic_matrix()
+    names = _order_names(orders) if orders is not None else None
+    if families is None:
+        return [syllable for name in names for syllable in matrix['orders'].get(name, ())]
+    syllables = []
+    for family in _family_names(families):
+        members = matrix['families'].get(family, {})
+        if names is None:
+            syllables.extend(members.values())
+        else:
+            syllables.extend(members[name] for name in names if name in members)
+    return syllables
+
+def ethiopic_uset(families: str|None = None, orders: int|str|None = None) -> _icu.UnicodeSet:
+    """Frozen UnicodeSet of the syllables in the given Ethiopic families and/or orders.
+
+    Sets are cached per selection, so repeated selections cost nothing.
+
+    Examples:
+        ethiopic_uset('ለ-መ')
+        ethiopic_uset(orders='1-3,7')
+        ethiopic_uset('መ-ቀ', '4,6')
+
+    Args:
+        families (str | None, optional): Ethiopic family or range of families. Defaults to None, all families.
+        orders (int | str | None, optional): Ethiopic order number or range of orders. Defaults to None, all orders.
+
+    Returns:
+        icu.UnicodeSet: The selected syllables.
+    """
+    key = (families, str(orders) if orders is not None else None)
+    uset = _SELECTIONS.get(key)
+    if uset is None:
+        uset = _icu.UnicodeSet()
+        uset.addAll(''.join(_selection(families, orders)))
+        uset.freeze()
+        _SELECTIONS[key] = uset
+    return uset
+
+def _regex_class(uset: _icu.UnicodeSet) -> str:
+    # Regex character class matching the code points of a UnicodeSet.
+    ranges = []
+    for start, end in uset.ranges():
+        ranges.append(_re.escape(start) if start == end else f'{_re.escape(start)}-{_re.escape(end)}')
+    return f'[{"".join(ranges)}]'
+
+def ethiopic_pattern(families: str|None = None, orders: int|str|None = None) -> str:
+    """UnicodeSet pattern, as compact ranges, for an Ethiopic family and/or order selection.
+
+    Examples:
+        ethiopic_pattern(orders=1) ➡︎ '[ሀለሐመ...]'
+    """
+    return ethiopic_uset(families, orders).toPattern()
+
+def ethiopic_regex(families: str|None = None, orders: int|str|None = None, flags: int = 0) -> _re.Pattern:
+    """Compiled regular expression matching one syllable from an Ethiopic family and/or order selection.
+
+    The character class is built from the ranges of ethiopic_uset(), and
+    compiled patterns are cached per selection and flags.
+
+    Examples:
+        ethiopic_regex('መ-ቀ', '4,6').findall(text)
+    """
+    key = (families, str(orders) if orders is not None else None, flags)
+    pattern = _SELECTION_PATTERNS.get(key)
+    if pattern is None:
+        pattern = _SELECTION_PATTERNS[key] = _re.compile(_regex_class(ethiopic_uset(families, orders)), flags)
+    return pattern
+
 def ethiopic_order(order: int|str) -> list[str]:
     """Create a list of all characters in a given Ethiopic order.
 
     Used to get a list of characters in a given Ethiopic order. Useful for
     creating named lists for regular expressions patterns with the `regex` module.
+    For a ready-made pattern use ethiopic_pattern() or ethiopic_regex().
 
     Examples:
         ethiopic_order(1)
@@ -485,27 +554,14 @@ def ethiopic_order(order: int|str) -> list[str]:
     Returns:
         list[str]: List of characters in the specified orders.
     """
-    if isinstance(order, int) and not 0 < order < 15:
-        raise ValueError('Input must be an integer between 1 and 14')
-    order_examples = {
-        1: 'መ', 2 : 'ሙ', 3 : 'ሚ', 4 : 'ማ', 5 : 'ሜ',
-        6 : 'ም', 7 : 'ሞ', 8 : 'ⶁ', 9 : 'ᎀ', 10 : 'ᎁ', 
-        11 : 'ሟ', 12 : 'ᎂ', 13 : 'ᎃ', 14 : 'ፙ'
-    }
-    if isinstance(order, int):
-        return EthiopicUCD(order_examples[order]).get_order_members()
-    else:
-        orders = expand_range(order)
-        pattern = []
-        for o in orders:
-            pattern = pattern + EthiopicUCD(order_examples[o]).get_order_members()
-        return pattern
+    return _selection(orders=order)
 
 def ethiopic_family(family: str) -> list[str]:
     """Create a list of all characters in a given Ethiopic family.
 
     Used to get a list of characters in a given Ethiopic family. Useful for
     creating named lists for regular expressions patterns with the `regex` module.
+    For a ready-made pattern use ethiopic_pattern() or ethiopic_regex().
 
     Examples:
         ethiopic_family('ለ')
@@ -518,17 +574,8 @@ def ethiopic_family(family: str) -> list[str]:
 
     Returns:
         list[str]: List of characters in the specified family.
-    """    
-    # if len(family) != 1:
-    #     raise ValueError("Input must be a single character")
-    pattern = []
-    if len(family) == 1:
-        pattern = EthiopicUCD(family).get_family_members()
-    else:
-        families = expand_range(family)
-        for f in families:
-            pattern = pattern + EthiopicUCD(f).get_family_members()
-    return pattern
+    """
+    return _selection(families=family)
 
 def filter_orders(families: str, orders: int|str) -> list[str]:
     """Create a list of all characters in given Ethiopic families and orders. 
@@ -538,18 +585,16 @@ def filter_orders(families: str, orders: int|str) -> list[str]:
     I.e. syllables of specified orders restricted to specified families).
 
     Examples:
-        filter_orders('መ-ቀ', '4,6') ➡︎ ['ር', 'ሻ', 'ሣ', 'ማ', 'ራ', 'ቅ', 'ሥ', 'ስ', 'ቃ', 'ም', 'ሳ', 'ሽ']
+        filter_orders('መ-ቀ', '4,6') ➡︎ ['ማ', 'ም', 'ሣ', 'ሥ', 'ራ', 'ር', 'ሳ', 'ስ', 'ሻ', 'ሽ', 'ቃ', 'ቅ']
 
     Args:
         family (str): Ethiopic family.
         order (int|str): Ethiopic order number or range of orders.
 
     Returns:
-        list[str]: List of characters in the specified family and order.
+        list[str]: List of characters in the specified family and order, in code point order.
     """
-    family = ethiopic_family(families)
-    order = ethiopic_order(orders)
-    return list(set(family) & set(order))
+    return list(ethiopic_uset(families, orders))
 
 # def expand_range(char_range: str) -> list[str]:
 #     """Expand Ethiopic order and family range into a list of orders or families.
@@ -619,6 +664,133 @@ def expand_range(char_range: str, filtered: bool = True) -> list[str, int]:
         results = [x for x in results if x in family_ids] if filtered else results
     return results
 
+# Ethiopic numerals: ፩-፱ (1-9), ፲-፺ (10-90), ፻ (100) and ፼ (10000). Numbers
+# are written in base-100 groups, most significant first, with ፻ after odd
+# groups and ፼ after even ones: 12345678 is ፲፪፻፴፬፼፶፮፻፸፰. As in CLDR's
+# Ethiopic number rules, ፩ is always omitted before ፻ (10100 is ፼፻), and
+# before ፼ only when it leads the numeral (10000 is ፼, 100010000 is ፼፩፼).
+_NUMERAL_VALUES = {chr(0x1369 + i): i + 1 for i in range(9)} | {chr(0x1372 + i): (i + 1) * 10 for i in range(9)}
+_HUNDRED, _TEN_THOUSAND = '\u137B', '\u137C'
+_NUMERAL_GROUPS = [
+    (chr(0x1371 + tens) if tens else '') + (chr(0x1368 + ones) if ones else '')
+    for tens, ones in (divmod(value, 10) for value in range(100))
+]
+
+_NUMERAL_RUN = _re.compile(_regex_class(EthiopicUCD.NUMBERS) + '+')
+
+@_lru_cache(maxsize=4096)
+def ethiopic_to_int(numeral: str) -> int:
+    """Convert an Ethiopic numeral to an integer.
+
+    Examples:
+        ethiopic_to_int('፲፪፻፴፬፼፶፮፻፸፰') ➡︎ 12345678
+        ethiopic_to_int('፻፼') ➡︎ 1000000
+
+    Args:
+        numeral (str): Ethiopic numeral.
+
+    Raises:
+        ValueError: The string is empty or contains characters other than Ethiopic numerals.
+
+    Returns:
+        int: Value of the numeral.
+    """
+    if not numeral:
+        raise ValueError('Empty numeral.')
+    total = hundreds = current = 0
+    for char in numeral:
+        value = _NUMERAL_VALUES.get(char)
+        if value is not None:
+            current += value
+        elif char == _HUNDRED:
+            hundreds += (current or 1) * 100
+            current = 0
+        elif char == _TEN_THOUSAND:
+            total = (total + hundreds + current or 1) * 10000
+            hundreds = current = 0
+        else:
+            raise ValueError(f'{char!r} is not an Ethiopic numeral.')
+    return total + hundreds + current
+
+def int_to_ethiopic(number: int) -> str:
+    """Convert a positive integer to an Ethiopic numeral.
+
+    Examples:
+        int_to_ethiopic(12345678) ➡︎ '፲፪፻፴፬፼፶፮፻፸፰'
+        int_to_ethiopic(100) ➡︎ '፻'
+        int_to_ethiopic(10100) ➡︎ '፼፻'
+        int_to_ethiopic(1000100) ➡︎ '፻፼፻'
+        int_to_ethiopic(100010000) ➡︎ '፼፩፼'
+
+    Args:
+        number (int): Number to convert.
+
+    Raises:
+        ValueError: Ethiopic numerals have no zero or negative numbers.
+
+    Returns:
+        str: Ethiopic numeral.
+    """
+    if number < 1:
+        raise ValueError('Ethiopic numerals can only represent positive integers.')
+    groups = []
+    while number:
+        number, group = divmod(number, 100)
+        groups.append(group)
+    parts = []
+    for index in range(len(groups) - 1, -1, -1):
+        group = groups[index]
+        if group and not (group == 1 and (index % 2 or index and index == len(groups) - 1)):
+            parts.append(_NUMERAL_GROUPS[group])
+        if index % 2:
+            if group:
+                parts.append(_HUNDRED)
+        elif index:
+            parts.append(_TEN_THOUSAND)
+    return ''.join(parts)
+
+def find_ethiopic_numerals(text: str):
+    """Find runs of Ethiopic numerals in text.
+
+    Yields:
+        tuple[int, int, str, int]: Start and end offsets, the numeral and its value.
+    """
+    for match in _NUMERAL_RUN.finditer(text):
+        yield match.start(), match.end(), match.group(), ethiopic_to_int(match.group())
+
+def replace_ethiopic_numerals(text: str, repl=str) -> str:
+    """Replace each run of Ethiopic numerals in text.
+
+    Args:
+        text (str): Text to convert.
+        repl (Callable[[int], str], optional): Formats the value of each numeral.
+            Defaults to str, giving Western digits.
+
+    Returns:
+        str: Converted text.
+    """
+    return _NUMERAL_RUN.sub(lambda match: repl(ethiopic_to_int(match.group())), text)
+
+def replace_ethiopic_numerals_iter(chunks, repl=str):
+    """Apply replace_ethiopic_numerals() to a stream of text chunks, such as lines of a file.
+
+    A numeral split across chunks is held back and converted whole.
+
+    Yields:
+        str: Converted text, chunk by chunk.
+    """
+    pending = ''
+    for chunk in chunks:
+        chunk = pending + chunk
+        end = len(chunk)
+        while end and chunk[end - 1] in EthiopicUCD.NUMBERS:
+            end -= 1
+        pending = chunk[end:]
+        if end:
+            yield replace_ethiopic_numerals(chunk[:end], repl)
+    if pending:
+        yield replace_ethiopic_numerals(pending, repl)
+
 def homophonic_equivalences(char: str, family: bool = False, language: str = 'am') -> list[str]:
     # Returns a list of language specific homophonic equivalences for the given character or family.
     if family and language not in ['am', 'ti']:
@@ -632,16 +804,223 @@ def homophonic_equivalences(char: str, family: bool = False, language: str = 'am
         homophones = expand_range(homophonic_syllable_equivalences.get(language).get(char, []), filtered=False)
     return homophones
 
+_HOMOPHONE_TABLES = {}
+
+def _family_table(language: str) -> dict[str, str]:
+    # Each syllable of a family listed in homophonic_family_equivalences maps
+    # to the syllable at the same offset (order) in the first listed range.
+    table = {}
+    for ranges in homophonic_family_equivalences[language].values():
+        ranges = [item.split('-') for item in ranges.split(',')]
+        base_start, base_end = ord(ranges[0][0]), ord(ranges[0][1])
+        for start, end in ranges[1:]:
+            for cp in range(ord(start), ord(end) + 1):
+                if base_start + cp - ord(start) <= base_end:
+                    table[chr(cp)] = chr(base_start + cp - ord(start))
+    return table
+
+def _homophone_table(language: str, family: bool = False) -> dict[int, str]:
+    # str.translate table mapping each syllable to the first of its
+    # homophonic equivalences, compiled once per language. With family, whole
+    # equivalent families are first folded onto one family.
+    table = _HOMOPHONE_TABLES.get((language, family))
+    if table is None:
+        if family and language not in ['am', 'ti']:
+            raise ValueError('Language must be "am" or "ti"')
+        if language not in ['am', 'gez', 'ti']:
+            raise ValueError('Language must be "am", "gez" or "ti"')
+        syllables = {char: equivalences[0] for char, equivalences in homophonic_syllable_equivalences[language].items()}
+        families = _family_table(language) if family else {}
+        table = {}
+        for char in syllables.keys() | families.keys():
+            folded = families.get(char, char)
+            folded = syllables.get(folded, folded)
+            if folded != char:
+                table[ord(char)] = folded
+        _HOMOPHONE_TABLES[(language, family)] = table
+    return table
+
 def homophonic_normalisation(text: str, language: str = 'am') -> str:
-    if language not in ['am', 'gez', 'ti']:
-        raise ValueError('Language must be "am", "gez" or "ti"')
-    chars = [*text]
-    chars = [homophonic_syllable_equivalences.get(language).get(char, char)[0] for char in chars]
-    return ''.join(chars)
+    return text.translate(_homophone_table(language))
 
 homophonic_normalization = homophonic_normalisation
 
+def homophonic_normalisation_iter(texts, language: str = 'am'):
+    """Apply homophonic_normalisation() to each string in an iterable, lazily.
+
+    Args:
+        texts (Iterable[str]): Strings to normalise.
+        language (str, optional): 'am', 'gez' or 'ti'. Defaults to 'am'.
+
+    Yields:
+        str: Normalised strings.
+    """
+    table = _homophone_table(language)
+    for text in texts:
+        yield text.translate(table)
+
+homophonic_normalization_iter = homophonic_normalisation_iter
+
 def homophonic_compare(text1: str, text2: str, language: str = 'am') -> bool:
-    if language not in ['am', 'gez', 'ti']:
-        raise ValueError('Language must be "am", "gez" or "ti"')
-    return homophonic_normalisation(text1, language) == homophonic_normalisation(text2, language)
+    table = _homophone_table(language)
+    return text1.translate(table) == text2.translate(table)
+
+
+_TOKEN = _re.compile(r'\w+')
+
+class HomophonicIndex():
+    """Inverted index for finding Ethiopic text regardless of homophonic spelling.
+
+    Documents and queries are normalised with the homophonic equivalences
+    of a language, and postings are kept per normalised word, or per
+    normalised character n-gram if ngram is set. Searching intersects the
+    postings of the query's keys, so its cost depends on the matching
+    documents rather than the size of the corpus. Document ids must be
+    strings or integers (not bools), so that save() and load() preserve them.
+
+    Examples:
+        index = HomophonicIndex('am')
+        index.add('doc1', 'ሰላም ለዓለም')
+        index.search('ሠላም')  ➡︎ ['doc1']
+
+    Args:
+        language (str, optional): 'am', 'gez' or 'ti'. Defaults to 'am'.
+        family (bool, optional): Also treat equivalent families
+            (homophonic_family_equivalences) as the same. Defaults to False.
+        ngram (int | None, optional): Index character n-grams of this length
+            instead of words, allowing substring search. Defaults to None.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, language: str = 'am', family: bool = False, ngram: int | None = None):
+        if ngram is not None and ngram < 1:
+            raise ValueError('ngram must be at least 1.')
+        self._language = language
+        self._family = family
+        self._ngram = ngram
+        self._table = _homophone_table(language, family)
+        self._documents = {}
+        self._sequence = {}
+        self._next = 0
+        self._postings = {}
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        return f"{class_name}(language={self._language}, family={self._family}, ngram={self._ngram}, documents={len(self._documents)})"
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._documents
+
+    def normalise(self, text: str) -> str:
+        return text.translate(self._table)
+
+    def _keys(self, normalised: str) -> set[str]:
+        tokens = _TOKEN.findall(normalised)
+        if self._ngram is None:
+            return set(tokens)
+        n = self._ngram
+        keys = set()
+        for token in tokens:
+            if len(token) <= n:
+                keys.add(token)
+            else:
+                keys.update(token[i:i + n] for i in range(len(token) - n + 1))
+        return keys
+
+    def add(self, doc_id: str | int, text: str) -> None:
+        """Add or replace a document.
+
+        Raises:
+            TypeError: doc_id is not a str or int, or is a bool.
+        """
+        # bool is an int subclass, and True == 1 would collide with id 1.
+        if not isinstance(doc_id, (str, int)) or isinstance(doc_id, bool):
+            raise TypeError(f'Document ids must be str or int, not {type(doc_id).__name__}.')
+        if doc_id in self._documents:
+            self.remove(doc_id)
+        self._documents[doc_id] = text
+        self._sequence[doc_id] = self._next
+        self._next += 1
+        for key in self._keys(self.normalise(text)):
+            self._postings.setdefault(key, set()).add(doc_id)
+
+    def remove(self, doc_id) -> None:
+        """Remove a document. Raises KeyError if it is not in the index."""
+        text = self._documents.pop(doc_id)
+        del self._sequence[doc_id]
+        for key in self._keys(self.normalise(text)):
+            postings = self._postings[key]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[key]
+
+    def get(self, doc_id) -> str | None:
+        return self._documents.get(doc_id)
+
+    def search(self, query: str) -> list:
+        """Documents containing every word of the query, ignoring homophonic variation.
+
+        With n-grams, each query word may occur anywhere inside a word of
+        the document.
+
+        Returns:
+            list: Matching document ids, in the order they were added.
+        """
+        words = _TOKEN.findall(self.normalise(query))
+        if not words:
+            return []
+        postings = []
+        for word in words:
+            if self._ngram is not None and len(word) < self._ngram:
+                # Shorter than an n-gram: any key containing the word matches.
+                postings.append(set().union(*(docs for key, docs in self._postings.items() if word in key)))
+            else:
+                postings.extend(self._postings.get(key, set()) for key in self._keys(word))
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        if self._ngram is not None:
+            # n-grams can match out of order; confirm each word occurs.
+            candidates = {
+                doc_id for doc_id in candidates
+                if all(word in self.normalise(self._documents[doc_id]) for word in words)
+            }
+        return sorted(candidates, key=self._sequence.__getitem__)
+
+    def save(self, filename: str) -> None:
+        """Write the index, including its postings, to a JSON file."""
+        doc_ids = sorted(self._documents, key=self._sequence.__getitem__)
+        position = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+        data = {
+            'format': self.FORMAT_VERSION,
+            'language': self._language,
+            'family': self._family,
+            'ngram': self._ngram,
+            'documents': [[doc_id, self._documents[doc_id]] for doc_id in doc_ids],
+            'postings': {key: sorted(position[doc_id] for doc_id in postings) for key, postings in self._postings.items()}
+        }
+        with open(filename, 'w', encoding='utf-8') as f:
+            _json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, filename: str) -> 'HomophonicIndex':
+        """Read an index written by save()."""
+        with open(filename, encoding='utf-8') as f:
+            data = _json.load(f)
+        if data.get('format') != cls.FORMAT_VERSION:
+            raise ValueError(f'Unsupported index format: {data.get("format")}')
+        index = cls(data['language'], data['family'], data['ngram'])
+        doc_ids = []
+        for doc_id, text in data['documents']:
+            index._documents[doc_id] = text
+            index._sequence[doc_id] = index._next
+            index._next += 1
+            doc_ids.append(doc_id)
+        index._postings = {key: {doc_ids[i] for i in positions} for key, positions in data['postings'].items()}
+        return index
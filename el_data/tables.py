@@ -0,0 +1,274 @@
+"""
+Precomputed Unicode property tables.
+
+Enumerated (integer) properties and binary properties are stored as
+two-stage lookup tables covering the full code space: a first stage
+indexed by the high bits of the code point selects a deduplicated block
+in the second stage, indexed by the low bits. Lookups are O(1) and never
+cross into ICU once the tables are loaded.
+
+The tables are built from ICU and can be written to a packaged file with
+
+    python -m el_data.build_tables
+
+If the packaged file is missing or was built for a different Unicode
+version, the tables are rebuilt in memory from ICU on first use.
+"""
+
+from array import array as _array
+import json as _json
+import os.path as _path
+import sys as _sys
+import zlib as _zlib
+
+import icu as _icu
+
+__all__ = [
+    'PropertyTable',
+    'build_property_tables',
+    'write_property_tables',
+    'read_property_tables',
+    'load_property_tables',
+    'property_value',
+    'property_values',
+    'has_property_table',
+    'property_accessor',
+    'property_value_name'
+]
+
+_BASE_DIR = _path.dirname(_path.abspath(__file__))
+TABLES_FILE = _path.join(_BASE_DIR, "ucd_tables.dat")
+
+MAX_CODEPOINT = 0x10FFFF
+_SHIFT = 8
+_BLOCK_SIZE = 1 << _SHIFT
+_BLOCK_MASK = _BLOCK_SIZE - 1
+_MAGIC = b'ELUCDT1\n'
+_FORMAT_VERSION = 1
+# Pseudo property id under which the packed binary properties are stored.
+BINARY_MASK = -1
+
+INT_PROPERTIES = list(range(_icu.UProperty.INT_START, _icu.UProperty.INT_LIMIT))
+
+class PropertyTable():
+    """Two-stage lookup table mapping code points to integer values."""
+    __slots__ = ('property', 'index', 'values')
+
+    def __init__(self, property: int, index: _array, values: _array):
+        self.property = property
+        self.index = index
+        self.values = values
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        return f"{class_name}(property={self.property}, blocks={len(self.values) >> _SHIFT}, typecode={self.values.typecode})"
+
+    @classmethod
+    def from_ranges(cls, property: int, ranges, typecode: str) -> 'PropertyTable':
+        """Build a table from (start, end, value) ranges, deduplicating identical blocks."""
+        full = _array(typecode, bytes(_array(typecode).itemsize * (MAX_CODEPOINT + 1)))
+        for start, end, value in ranges:
+            if value:
+                full[start:end + 1] = _array(typecode, [value]) * (end - start + 1)
+        index = _array('H')
+        values = _array(typecode)
+        blocks = {}
+        for offset in range(0, MAX_CODEPOINT + 1, _BLOCK_SIZE):
+            block = full[offset:offset + _BLOCK_SIZE].tobytes()
+            position = blocks.get(block)
+            if position is None:
+                position = blocks[block] = len(blocks)
+                values.frombytes(block)
+            index.append(position)
+        return cls(property, index, values)
+
+    def get(self, cp: int) -> int:
+        return self.values[(self.index[cp >> _SHIFT] << _SHIFT) | (cp & _BLOCK_MASK)]
+
+    def get_many(self, cps) -> list[int]:
+        index, values = self.index, self.values
+        return [values[(index[cp >> _SHIFT] << _SHIFT) | (cp & _BLOCK_MASK)] for cp in cps]
+
+def _int_property_ranges(property: int):
+    umap = _icu.Char.getIntPropertyMap(property)
+    start = 0
+    while start <= MAX_CODEPOINT:
+        end = umap.getRange(start)
+        yield start, end, umap.get(start)
+        start = end + 1
+
+def _binary_mask_ranges(binary_properties: list[int]):
+    # Ranges of a single property never touch, so toggling its bit at each
+    # range start and one past each range end sweeps out the combined masks.
+    toggles = {}
+    for bit, property in enumerate(binary_properties):
+        for start, end in _icu.Char.getBinaryPropertySet(property).ranges():
+            for point in (ord(start), ord(end) + 1):
+                toggles[point] = toggles.get(point, 0) ^ (1 << bit)
+    points = sorted(toggles) + [MAX_CODEPOINT + 1]
+    mask = 0
+    for point, next_point in zip(points, points[1:]):
+        mask ^= toggles[point]
+        yield point, next_point - 1, mask
+
+def _typecode(max_value: int) -> str:
+    for typecode in ('B', 'H', 'I', 'Q'):
+        if max_value < 1 << (8 * _array(typecode).itemsize):
+            return typecode
+    raise ValueError(f'Value {max_value} does not fit in a table.')
+
+def build_property_tables(binary_properties: list[int], int_properties: list[int] = INT_PROPERTIES) -> dict[int, PropertyTable]:
+    """Build lookup tables from ICU.
+
+    Binary properties are packed into a single table of bit masks, stored
+    under BINARY_MASK, where bit n is set for binary_properties[n].
+
+    Args:
+        binary_properties (list[int]): Binary properties to pack, at most 64.
+        int_properties (list[int], optional): Enumerated properties to tabulate.
+            Defaults to all ICU integer properties.
+
+    Returns:
+        dict[int, PropertyTable]: Tables keyed by property.
+    """
+    if len(binary_properties) > 64:
+        raise ValueError('At most 64 binary properties can be packed into one table.')
+    tables = {}
+    for property in int_properties:
+        typecode = _typecode(_icu.Char.getIntPropertyMaxValue(property))
+        tables[property] = PropertyTable.from_ranges(property, _int_property_ranges(property), typecode)
+    tables[BINARY_MASK] = PropertyTable.from_ranges(BINARY_MASK, _binary_mask_ranges(binary_properties), 'Q')
+    return tables
+
+def write_property_tables(tables: dict[int, PropertyTable], binary_properties: list[int], filename: str = TABLES_FILE) -> None:
+    """Write tables to a compressed file, tagged with the ICU and Unicode versions."""
+    header = {
+        'format': _FORMAT_VERSION,
+        'icu_version': _icu.ICU_VERSION,
+        'unicode_version': _icu.UNICODE_VERSION,
+        'binary_properties': binary_properties,
+        'tables': []
+    }
+    payload = bytearray()
+    for property, table in tables.items():
+        entry = {'property': property, 'typecode': table.values.typecode}
+        for part, data in (('index', table.index), ('values', table.values)):
+            if _sys.byteorder == 'big':
+                data = _array(data.typecode, data)
+                data.byteswap()
+            raw = data.tobytes()
+            entry[part] = [len(payload), len(raw)]
+            payload += raw
+        header['tables'].append(entry)
+    header_bytes = _json.dumps(header).encode('utf-8')
+    with open(filename, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(len(header_bytes).to_bytes(4, 'little'))
+        f.write(header_bytes)
+        f.write(_zlib.compress(bytes(payload), 9))
+
+def read_property_tables(binary_properties: list[int], filename: str = TABLES_FILE) -> dict[int, PropertyTable] | None:
+    """Read tables from file, or return None if the file is missing or stale."""
+    if not _path.exists(filename):
+        return None
+    with open(filename, 'rb') as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            return None
+        header = _json.loads(f.read(int.from_bytes(f.read(4), 'little')))
+        if (header['format'] != _FORMAT_VERSION
+                or header['unicode_version'] != _icu.UNICODE_VERSION
+                or header['binary_properties'] != list(binary_properties)):
+            return None
+        payload = _zlib.decompress(f.read())
+    tables = {}
+    for entry in header['tables']:
+        parts = []
+        for part, typecode in (('index', 'H'), ('values', entry['typecode'])):
+            offset, length = entry[part]
+            data = _array(typecode, payload[offset:offset + length])
+            if _sys.byteorder == 'big':
+                data.byteswap()
+            parts.append(data)
+        tables[entry['property']] = PropertyTable(entry['property'], *parts)
+    return tables
+
+_TABLES: dict[int, PropertyTable] = {}
+_BINARY_BITS: dict[int, int] = {}
+
+def load_property_tables(binary_properties: list[int] | None = None, filename: str = TABLES_FILE) -> dict[int, PropertyTable]:
+    """Return the process-wide tables, loading or building them on first use.
+
+    Args:
+        binary_properties (list[int] | None, optional): Binary properties to
+            pack. Defaults to el_data.data.BINARY_PROPERTIES.
+        filename (str, optional): Packaged tables file. Defaults to TABLES_FILE.
+
+    Returns:
+        dict[int, PropertyTable]: Tables keyed by property.
+    """
+    if not _TABLES:
+        if binary_properties is None:
+            from .data import BINARY_PROPERTIES as binary_properties
+        tables = read_property_tables(binary_properties, filename)
+        if tables is None:
+            tables = build_property_tables(binary_properties)
+        _BINARY_BITS.update({property: bit for bit, property in enumerate(binary_properties)})
+        _TABLES.update(tables)
+    return _TABLES
+
+def property_value(cp: int, property: int) -> int | bool:
+    """Integer value of an enumerated property, or bool for a binary property, for a code point."""
+    tables = _TABLES or load_property_tables()
+    bit = _BINARY_BITS.get(property)
+    if bit is not None:
+        return bool(tables[BINARY_MASK].get(cp) >> bit & 1)
+    return tables[property].get(cp)
+
+def property_values(cps, property: int) -> list[int] | list[bool]:
+    """Vectorised property_value() over an iterable of code points."""
+    tables = _TABLES or load_property_tables()
+    bit = _BINARY_BITS.get(property)
+    if bit is not None:
+        return [bool(mask >> bit & 1) for mask in tables[BINARY_MASK].get_many(cps)]
+    return tables[property].get_many(cps)
+
+def has_property_table(property: int) -> bool:
+    load_property_tables()
+    return property in _BINARY_BITS or (property != BINARY_MASK and property in _TABLES)
+
+_VALUE_NAMES: dict[tuple[int, int, int], str] = {}
+
+def property_value_name(property: int, value: int, short_name: bool = False) -> str:
+    """Cached equivalent of icu.Char.getPropertyValueName()."""
+    name_choice = 0 if short_name else 1
+    key = (property, value, name_choice)
+    name = _VALUE_NAMES.get(key)
+    if name is None:
+        name = _VALUE_NAMES[key] = _icu.Char.getPropertyValueName(property, value, name_choice)
+    return name
+
+_ACCESSORS: dict[tuple[int, bool], object] = {}
+
+def property_accessor(property: int, short_name: bool = False):
+    """Return a cached function mapping a code point to the property value name.
+
+    Binary properties map to bool. Returns None if there is no table for
+    the property.
+    """
+    key = (property, short_name)
+    accessor = _ACCESSORS.get(key)
+    if accessor is None:
+        if not has_property_table(property):
+            return None
+        bit = _BINARY_BITS.get(property)
+        if bit is not None:
+            table = _TABLES[BINARY_MASK]
+            def accessor(cp, index=table.index, values=table.values, bit=bit):
+                return bool(values[(index[cp >> _SHIFT] << _SHIFT) | (cp & _BLOCK_MASK)] >> bit & 1)
+        else:
+            table = _TABLES[property]
+            names = [property_value_name(property, value, short_name) for value in range(_icu.Char.getIntPropertyMaxValue(property) + 1)]
+            def accessor(cp, index=table.index, values=table.values, names=names):
+                return names[values[(index[cp >> _SHIFT] << _SHIFT) | (cp & _BLOCK_MASK)]]
+        _ACCESSORS[key] = accessor
+    return accessor
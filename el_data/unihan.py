@@ -1,54 +1,95 @@
-import icu as _icu
-import sqlite3 as _sqlite3
+from . import db as _db
 from .data import UCD, UCDString
 from functools import partialmethod as _partialmethod
 # import json as _json
 from rich.console import Console as _Console
-import os.path as _path
 
 class Unihan(UCD):
 
-   conn = None
+   _properties = ['id', 'ucn', 'char', 'kCangjie', 'kCantonese', 'kDefinition', 'kHanYu', 'kIRGHanyuDaZidian', 'kIRGKangXi', 'kIRG_GSource', 'kIRG_JSource', 'kIRG_TSource', 'kJapanese', 'kKangXi', 'kMandarin', 'kMojiJoho', 'kMorohashi', 'kRSUnicode', 'kSemanticVariant', 'kTotalStrokes', 'kCihaiT', 'kHanyuPinyin', 'kIRG_KSource', 'kSBGY', 'kJIS0213', 'kNelson', 'kRSAdobe_Japan1_6', 'kStrange', 'kCowles', 'kMatthews', 'kOtherNumeric', 'kPhonetic', 'kSpoofingVariant', 'kGSR', 'kIRG_KPSource', 'kIRG_VSource', 'kFenn', 'kFennIndex', 'kKarlgren', 'kVietnameseNumeric', 'kIRG_HSource', 'kUnihanCore2020', 'kTraditionalVariant', 'kFourCornerCode', 'kSMSZD2003Index', 'kTGH', 'kTGHZ2013', 'kXHC1983', 'kMeyerWempe', 'kVietnamese', 'kSimplifiedVariant', 'kSMSZD2003Readings', 'kHangul', 'kKoreanName', 'kSpecializedSemanticVariant', 'kEACC', 'kLau', 'kCheungBauer', 'kCheungBauerIndex', 'kIRG_USource', 'kIICore', 'kTang', 'kZhuangNumeric', 'kZVariant', 'kTaiwanTelegraph', 'kIRG_MSource', 'kJapaneseKun', 'kJapaneseOn', 'kJa', 'kIRG_UKSource', 'kAlternateTotalStrokes', 'kBigFive', 'kCCCII', 'kCNS1986', 'kCNS1992', 'kDaeJaweon', 'kFrequency', 'kGB0', 'kGB1', 'kGradeLevel', 'kHDZRadBreak', 'kHKGlyph', 'kHanyuPinlu', 'kIRGDaeJaweon', 'kJis0', 'kJoyoKanji', 'kKorean', 'kKoreanEducationHanja', 'kMainlandTelegraph', 'kPrimaryNumeric', 'kXerox', 'kGB5', 'kJis1', 'kPseudoGB1', 'kGB3', 'kGB8', 'kJinmeiyoKanji', 'kIBMJapan', 'kAccountingNumeric', 'kGB7', 'kCompatibilityVariant', 'kIRG_SSource']
+   # Keep IN (...) lists below SQLite's default limit on bound parameters.
+   _BATCH_SIZE = 900
 
    def __init__(self, char):
-      BASE_DIR = _path.dirname(_path.abspath(__file__))
-      data_db = _path.join(BASE_DIR, "data.db")
-      if Unihan.conn is None:
-         try:
-            Unihan.conn = _sqlite3.connect(data_db)
-            Unihan.cursor = Unihan.conn.cursor()
-         except Exception as error:
-            print("Error: Connection not established {}".format(error))
-         else:
-            print("Connection established")
-      self._char = char
-      self._name = _icu.Char.charName(self._char)
-      self._cp = f'{ord(self._char):04X}'
-      self.data = (
-            self._char,
-            self._cp,
-            self._name,
-            self.script(),
-            self.block(),
-            self.general_category_code(),
-            self.bidi_class_code(),
-            self.combining_class()
-      )
-      self._properties = ['id', 'ucn', 'char', 'kCangjie', 'kCantonese', 'kDefinition', 'kHanYu', 'kIRGHanyuDaZidian', 'kIRGKangXi', 'kIRG_GSource', 'kIRG_JSource', 'kIRG_TSource', 'kJapanese', 'kKangXi', 'kMandarin', 'kMojiJoho', 'kMorohashi', 'kRSUnicode', 'kSemanticVariant', 'kTotalStrokes', 'kCihaiT', 'kHanyuPinyin', 'kIRG_KSource', 'kSBGY', 'kJIS0213', 'kNelson', 'kRSAdobe_Japan1_6', 'kStrange', 'kCowles', 'kMatthews', 'kOtherNumeric', 'kPhonetic', 'kSpoofingVariant', 'kGSR', 'kIRG_KPSource', 'kIRG_VSource', 'kFenn', 'kFennIndex', 'kKarlgren', 'kVietnameseNumeric', 'kIRG_HSource', 'kUnihanCore2020', 'kTraditionalVariant', 'kFourCornerCode', 'kSMSZD2003Index', 'kTGH', 'kTGHZ2013', 'kXHC1983', 'kMeyerWempe', 'kVietnamese', 'kSimplifiedVariant', 'kSMSZD2003Readings', 'kHangul', 'kKoreanName', 'kSpecializedSemanticVariant', 'kEACC', 'kLau', 'kCheungBauer', 'kCheungBauerIndex', 'kIRG_USource', 'kIICore', 'kTang', 'kZhuangNumeric', 'kZVariant', 'kTaiwanTelegraph', 'kIRG_MSource', 'kJapaneseKun', 'kJapaneseOn', 'kJa', 'kIRG_UKSource', 'kAlternateTotalStrokes', 'kBigFive', 'kCCCII', 'kCNS1986', 'kCNS1992', 'kDaeJaweon', 'kFrequency', 'kGB0', 'kGB1', 'kGradeLevel', 'kHDZRadBreak', 'kHKGlyph', 'kHanyuPinlu', 'kIRGDaeJaweon', 'kJis0', 'kJoyoKanji', 'kKorean', 'kKoreanEducationHanja', 'kMainlandTelegraph', 'kPrimaryNumeric', 'kXerox', 'kGB5', 'kJis1', 'kPseudoGB1', 'kGB3', 'kGB8', 'kJinmeiyoKanji', 'kIBMJapan', 'kAccountingNumeric', 'kGB7', 'kCompatibilityVariant', 'kIRG_SSource']
+      super().__init__(char)
+      self._row = {}
 
    def _all_unihan(self):
-      query = f"SELECT * FROM unihan WHERE char = '{self._char}'"
-      results = Unihan.cursor.execute(query).fetchall()
+      query = "SELECT * FROM unihan WHERE char = ?"
+      results = _db.fetchall(query, (self._char,))
       return results
 
-   def _get_uh_property(self, property):
-      query = f"SELECT {property} FROM unihan WHERE char = '{self._char}'"
-      result = Unihan.cursor.execute(query).fetchone()
-      # return _json.loads(result[0])
-      if len(result[0]) == 1:
-         data = result[0][0]
+   @staticmethod
+   def _clean_uh_value(value):
+      # return _json.loads(value)
+      if value is not None and len(value) == 1:
+         data = value[0]
          return data.replace('"', '')
-      return result[0]
+      return value
+
+   @classmethod
+   def _validate_properties(cls, properties):
+      unknown = [p for p in properties if p not in cls._properties]
+      if unknown:
+         raise ValueError(f"Unknown Unihan properties: {', '.join(unknown)}")
+
+   @classmethod
+   def bulk_properties(cls, chars, properties=None) -> dict[str, list]:
+      """Retrieve Unihan properties for many characters with batched queries.
+
+      Characters are looked up with parameterised IN (...) queries, at most
+      _BATCH_SIZE characters per query, rather than one query per
+      character and property.
+
+      Examples:
+         Unihan.bulk_properties('你好', ['kDefinition', 'kMandarin'])
+
+      Args:
+         chars (Iterable[str]): Characters to look up. Duplicates are allowed.
+         properties (list[str] | None, optional): Unihan properties to retrieve.
+            Defaults to None, i.e. all properties.
+
+      Returns:
+         dict[str, list]: Column per property, aligned with a 'char' column.
+            Characters missing from the database have None values.
+      """
+      properties = list(properties) if properties is not None else [p for p in cls._properties if p != 'char']
+      cls._validate_properties(properties)
+      chars = list(chars)
+      rows = cls._fetch_rows(set(chars), properties)
+      result = {'char': chars}
+      for i, property in enumerate(properties):
+         result[property] = [rows[char][i] if char in rows else None for char in chars]
+      return result
+
+   @classmethod
+   def _fetch_rows(cls, chars, properties) -> dict[str, tuple]:
+      columns = ", ".join(["char", *(_db.quote_identifier(p) for p in properties)])
+      chars = list(chars)
+      rows = {}
+      for start in range(0, len(chars), cls._BATCH_SIZE):
+         batch = chars[start:start + cls._BATCH_SIZE]
+         placeholders = ", ".join("?" * len(batch))
+         query = f"SELECT {columns} FROM unihan WHERE char IN ({placeholders})"
+         for row in _db.fetchall(query, batch):
+            rows[row[0]] = tuple(cls._clean_uh_value(value) for value in row[1:])
+      return rows
+
+   def prefetch(self, properties=None):
+      """Fetch properties in one query so later accessors read from the cached row."""
+      properties = list(properties) if properties is not None else [p for p in self._properties if p != 'char']
+      self._validate_properties(properties)
+      row = self._fetch_rows([self._char], properties).get(self._char)
+      self._row.update(zip(properties, row) if row else dict.fromkeys(properties))
+      return self
+
+   def _get_uh_property(self, property):
+      if property in self._row:
+         return self._row[property]
+      query = f"SELECT {_db.quote_identifier(property)} FROM unihan WHERE char = ?"
+      result = _db.fetchone(query, (self._char,))
+      self._row[property] = self._clean_uh_value(result[0])
+      return self._row[property]
 
    def char(self):
          return self._char
@@ -219,9 +260,28 @@ class Unihan(UCD):
       return None
 
 class UnihanString(UCDString):
-    def __init__(self, chars):
-        self._chars = [Unihan(char) for char in chars]
-        self.data = [c.data for c in self._chars]
+    _ucd_class = Unihan
+
+    def unihan_properties(self, properties=None) -> dict[str, list]:
+        """Retrieve Unihan properties for every character with batched queries.
+
+        The fetched rows are also attached to the characters' Unihan objects,
+        so their per-property accessors no longer query the database.
+
+        Args:
+            properties (list[str] | None, optional): Unihan properties to retrieve.
+                Defaults to None, i.e. all properties.
+
+        Returns:
+            dict[str, list]: Column per property, one value per character.
+        """
+        distinct = sorted(set(self.characters()))
+        columns = Unihan.bulk_properties(distinct, properties)
+        del columns['char']
+        rows = {char: {property: values[i] for property, values in columns.items()} for i, char in enumerate(distinct)}
+        for c in set(self._chars):
+            c._row.update(rows[c._char])
+        return {property: [rows[char][property] for char in self.characters()] for property in columns}
 
     def __str__(self):
         return "".join(self.characters())
@@ -0,0 +1,57 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import el_data.cldr as cldr
+
+ROOT_XML = '''<?xml version="1.0" encoding="UTF-8" ?>
+<ldml><identity><language type="root"/></identity><characters><exemplarCharacters type="index">[A-Z]</exemplarCharacters></characters></ldml>
+'''
+AM_XML = '''<?xml version="1.0" encoding="UTF-8" ?>
+<ldml><identity><language type="am"/></identity><characters><exemplarCharacters>[ሀ ሁ ሂ]</exemplarCharacters></characters><layout><orientation><characterOrder>left-to-right</characterOrder></orientation></layout></ldml>
+'''
+
+class SeededCacheTestCase(unittest.TestCase):
+    # Offline LDML cache seeded from a minimal CLDR checkout.
+    def setUp(self):
+        self._settings = cldr.configure_ldml_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        main = Path(self._tmp.name) / 'checkout' / 'common' / 'main'
+        main.mkdir(parents=True)
+        (main / 'root.xml').write_text(ROOT_XML, encoding='utf-8')
+        (main / 'am.xml').write_text(AM_XML, encoding='utf-8')
+        cldr.configure_ldml_cache(cache_dir=str(Path(self._tmp.name) / 'cache'), offline=True)
+        cldr.seed_ldml_cache(str(main.parent.parent))
+        cldr.clear_exemplar_cache()
+        cldr.clear_parent_cache()
+
+    def tearDown(self):
+        cldr.clear_exemplar_cache()
+        cldr.clear_parent_cache()
+        cldr.configure_ldml_cache(**self._settings)
+        self._tmp.cleanup()
+
+class PrunedSectionsTest(SeededCacheTestCase):
+    def test_pruned_instance_does_not_poison_exemplar_cache(self):
+        pruned = cldr.CLDR('am', sections=('layout',))
+        self.assertEqual(pruned.get_exemplars()['main'].toPattern(), '[ሀ-ሂ]')
+        self.assertEqual(cldr.CLDR('am').get_exemplars()['main'].toPattern(), '[ሀ-ሂ]')
+        self.assertEqual(cldr.get_exemplars('am')['main'].toPattern(), '[ሀ-ሂ]')
+        self.assertEqual(cldr.get_exemplars('am')['index'].toPattern(), '[A-Z]')
+
+class CoverageTypesTest(SeededCacheTestCase):
+    def test_types_from_generator(self):
+        am = cldr.CLDR('am')
+        result = am.check_coverage('ሀa', types=(type for type in ['main']))
+        self.assertEqual(result['main']['clusters'], {'a': 1})
+        self.assertEqual(am.check_coverage('ሀa', types=['main'])['main']['count'], 1)
+
+    def test_invalid_types(self):
+        am = cldr.CLDR('am')
+        with self.assertRaises(TypeError):
+            am.check_coverage('ሀ', types='main')
+        with self.assertRaises(ValueError):
+            am.check_coverage('ሀ', types=['main', 'numbers'])
+
+if __name__ == '__main__':
+    unittest.main()